@@ -4,45 +4,81 @@
 從 JSON 配置文件載入內容過濾和處理設定
 """
 
+import copy
 import json
 import os
 import logging
-from typing import Dict, Any, List, Optional
+from functools import cached_property
+from typing import Dict, Any, Iterable, List, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson 為選用加速套件，未安裝時退回標準函式庫
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick 為選用加速套件，未安裝時改用逐一子字串比對
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# 已解析配置快取，鍵為 (絕對路徑, st_mtime_ns, st_size)，檔案未變動時免重新解析
+_CONFIG_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
 class ConfigLoader:
     """配置載入器"""
     
+    # 已找到的配置文件路徑，鍵為 config_path，後續實例可略過路徑搜尋
+    _resolved_paths: Dict[str, str] = {}
+    
     def __init__(self, config_path: str = "config/content_filter_config.json"):
         self.config_path = config_path
-        self.config = self._load_config()
+    
+    @cached_property
+    def config(self) -> Dict[str, Any]:
+        """配置內容，首次存取時才從磁碟載入"""
+        return self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
         """載入配置文件"""
         try:
-            # 嘗試從多個位置載入配置文件
-            possible_paths = [
+            # 嘗試從多個位置載入配置文件（先試上次找到的路徑，並去除重複候選）
+            possible_paths = dict.fromkeys([
+                self._resolved_paths.get(self.config_path, self.config_path),
                 self.config_path,
                 os.path.join(os.path.dirname(__file__), "..", self.config_path),
                 os.path.join(os.getcwd(), self.config_path)
-            ]
+            ])
             
             for path in possible_paths:
-                if os.path.exists(path):
-                    with open(path, 'r', encoding='utf-8') as f:
-                        config = json.load(f)
-                    logger.info(f"成功載入配置文件: {path}")
-                    return config
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                self._resolved_paths[self.config_path] = path
+                key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+                if key not in _CONFIG_CACHE:
+                    data = Path(path).read_bytes()
+                    _CONFIG_CACHE[key] = orjson.loads(data) if orjson else json.loads(data)
+                    logger.info("成功載入配置文件: %s", path)
+                # 回傳副本，避免 update_config 修改到快取內容
+                return copy.deepcopy(_CONFIG_CACHE[key])
             
-            logger.warning(f"找不到配置文件，使用預設配置")
+            logger.warning("找不到配置文件，使用預設配置")
             return self._get_default_config()
             
         except Exception as e:
-            logger.error(f"載入配置文件時發生錯誤: {e}")
+            logger.error("載入配置文件時發生錯誤: %s", e)
             return self._get_default_config()
     
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """清除已解析的配置快取與已找到的配置文件路徑"""
+        _CONFIG_CACHE.clear()
+        cls._resolved_paths.clear()
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """取得預設配置"""
         return {
@@ -75,44 +111,131 @@ class ConfigLoader:
             }
         }
     
+    @cached_property
+    def _views(self) -> Dict[str, Any]:
+        """由配置衍生的快取檢視，避免每次呼叫 getter 時重複查詢巢狀字典"""
+        content_filter = self.config.get("content_filter", {})
+        preview = self.config.get("preview", {})
+        blacklist_keywords = content_filter.get("blacklist_keywords", [])
+        allowed_agencies = content_filter.get("allowed_agencies", [])
+        return {
+            "content_filter": content_filter,
+            "preview": preview,
+            "processing": self.config.get("processing", {}),
+            "logging": self.config.get("logging", {}),
+            "filter_enabled": content_filter.get("enabled", True),
+            "preview_enabled": preview.get("enabled", True),
+            "blacklist_keywords": blacklist_keywords,
+            "allowed_agencies": allowed_agencies,
+            # 可變集合，由 add_* 就地更新，避免每次新增都重建整份檢視
+            "blacklist_set": set(blacklist_keywords),
+            "allowed_agency_set": set(allowed_agencies),
+            "blacklist_patterns": self._index_blacklist_patterns(blacklist_keywords),
+            "content_limits": content_filter.get("content_limits", {
+                "min_length": 10,
+                "max_length": 10000
+            }),
+        }
+    
+    @cached_property
+    def _blacklist_automaton(self):
+        """黑名單自動機，首次比對時才建立，僅在關鍵詞變更時失效"""
+        return self._build_blacklist_automaton(self._views["blacklist_patterns"])
+    
+    @staticmethod
+    def _index_blacklist_patterns(keywords: Iterable[str], patterns: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """建立小寫關鍵詞到原始拼寫的對照，比對時不分大小寫，命中時回報原始關鍵詞"""
+        if patterns is None:
+            patterns = {}
+        for keyword in keywords:
+            patterns.setdefault(keyword.lower(), keyword)
+        return patterns
+    
+    @staticmethod
+    def _build_blacklist_automaton(patterns: Dict[str, str]):
+        """建立黑名單關鍵詞的 Aho-Corasick 自動機，單次掃描即可比對所有關鍵詞"""
+        if ahocorasick is None or not patterns:
+            return None
+        automaton = ahocorasick.Automaton()
+        for pattern, keyword in patterns.items():
+            automaton.add_word(pattern, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _rebuild_views(self) -> None:
+        """配置變更後重建衍生檢視"""
+        self.__dict__.pop("_views", None)
+        self.__dict__.pop("_blacklist_automaton", None)
+    
+    def _ensure_content_filter_list(self, key: str) -> List[str]:
+        """取得 content_filter 下的清單，配置中不存在時先建立，確保就地修改會寫回配置"""
+        content_filter = self.config.setdefault("content_filter", {})
+        values = content_filter.get(key)
+        if values is None:
+            content_filter[key] = values = []
+            self._rebuild_views()
+        return values
+    
     def get_content_filter_config(self) -> Dict[str, Any]:
         """取得內容過濾配置"""
-        return self.config.get("content_filter", {})
+        return self._views["content_filter"]
     
     def get_preview_config(self) -> Dict[str, Any]:
         """取得預覽配置"""
-        return self.config.get("preview", {})
+        return self._views["preview"]
     
     def get_processing_config(self) -> Dict[str, Any]:
         """取得處理配置"""
-        return self.config.get("processing", {})
+        return self._views["processing"]
     
     def get_logging_config(self) -> Dict[str, Any]:
         """取得日誌配置"""
-        return self.config.get("logging", {})
+        return self._views["logging"]
     
     def is_content_filter_enabled(self) -> bool:
         """檢查內容過濾是否啟用"""
-        return self.get_content_filter_config().get("enabled", True)
+        return self._views["filter_enabled"]
     
     def is_preview_enabled(self) -> bool:
         """檢查預覽是否啟用"""
-        return self.get_preview_config().get("enabled", True)
+        return self._views["preview_enabled"]
     
     def get_blacklist_keywords(self) -> List[str]:
         """取得黑名單關鍵詞"""
-        return self.get_content_filter_config().get("blacklist_keywords", [])
+        return self._views["blacklist_keywords"]
     
     def get_allowed_agencies(self) -> List[str]:
         """取得允許的機關清單"""
-        return self.get_content_filter_config().get("allowed_agencies", [])
+        return self._views["allowed_agencies"]
     
     def get_content_limits(self) -> Dict[str, int]:
         """取得內容長度限制"""
-        return self.get_content_filter_config().get("content_limits", {
-            "min_length": 10,
-            "max_length": 10000
-        })
+        return self._views["content_limits"]
+    
+    def scan_blacklist(self, text: str) -> List[str]:
+        """掃描文字並回傳命中的黑名單關鍵詞（已去重）"""
+        if not text:
+            return []
+        text_lower = text.lower()
+        automaton = self._blacklist_automaton
+        if automaton is not None:
+            return list(dict.fromkeys(keyword for _, keyword in automaton.iter(text_lower)))
+        return [keyword for pattern, keyword in self._views["blacklist_patterns"].items() if pattern in text_lower]
+    
+    def contains_blacklisted(self, text: str) -> bool:
+        """檢查文字是否包含黑名單關鍵詞"""
+        if not text:
+            return False
+        automaton = self._blacklist_automaton
+        if automaton is not None:
+            return next(automaton.iter(text.lower()), None) is not None
+        text_lower = text.lower()
+        return any(pattern in text_lower for pattern in self._views["blacklist_patterns"])
+    
+    def is_agency_allowed(self, name: str) -> bool:
+        """檢查機關是否在允許清單中（空清單表示允許所有機關）"""
+        allowed = self._views["allowed_agency_set"]
+        return not allowed or name in allowed
     
     def save_config(self, config_path: Optional[str] = None) -> bool:
         """儲存配置到文件"""
@@ -122,14 +245,25 @@ class ConfigLoader:
             # 確保目錄存在
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
             
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+            if orjson:
+                data = orjson.dumps(
+                    self.config,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+                )
+            else:
+                data = json.dumps(self.config, ensure_ascii=False, indent=2).encode('utf-8')
+            
+            # 先寫入暫存檔再原子替換，避免寫入中斷造成配置文件損毀
+            tmp_path = save_path + '.tmp'
+            with open(tmp_path, 'wb', buffering=1 << 20) as f:
+                f.write(data)
+            os.replace(tmp_path, save_path)
             
-            logger.info(f"配置已儲存到: {save_path}")
+            logger.info("配置已儲存到: %s", save_path)
             return True
             
         except Exception as e:
-            logger.error(f"儲存配置時發生錯誤: {e}")
+            logger.error("儲存配置時發生錯誤: %s", e)
             return False
     
     def update_config(self, section: str, key: str, value: Any) -> bool:
@@ -139,56 +273,71 @@ class ConfigLoader:
                 self.config[section] = {}
             
             self.config[section][key] = value
-            logger.info(f"更新配置: {section}.{key} = {value}")
+            self._rebuild_views()
+            logger.info("更新配置: %s.%s = %s", section, key, value)
             return True
             
         except Exception as e:
-            logger.error(f"更新配置時發生錯誤: {e}")
+            logger.error("更新配置時發生錯誤: %s", e)
             return False
     
     def add_blacklist_keyword(self, keyword: str) -> bool:
         """新增黑名單關鍵詞"""
+        return self.add_blacklist_keywords([keyword]) > 0
+    
+    def add_blacklist_keywords(self, keywords: Iterable[str]) -> int:
+        """批次新增黑名單關鍵詞，回傳實際新增的數量"""
         try:
-            keywords = self.get_blacklist_keywords()
-            if keyword not in keywords:
-                keywords.append(keyword)
-                self.update_config("content_filter", "blacklist_keywords", keywords)
-                return True
-            return False
+            new_keywords = [k for k in dict.fromkeys(keywords) if k not in self._views["blacklist_set"]]
+            if new_keywords:
+                # 就地更新配置清單與集合，自動機待下次比對時才重建
+                self._ensure_content_filter_list("blacklist_keywords").extend(new_keywords)
+                self._views["blacklist_set"].update(new_keywords)
+                self._index_blacklist_patterns(new_keywords, self._views["blacklist_patterns"])
+                self.__dict__.pop("_blacklist_automaton", None)
+                logger.info("新增黑名單關鍵詞: %s", new_keywords)
+            return len(new_keywords)
         except Exception as e:
-            logger.error(f"新增黑名單關鍵詞時發生錯誤: {e}")
-            return False
+            logger.error("新增黑名單關鍵詞時發生錯誤: %s", e)
+            return 0
     
     def add_allowed_agency(self, agency: str) -> bool:
         """新增允許的機關"""
+        return self.add_allowed_agencies([agency]) > 0
+    
+    def add_allowed_agencies(self, agencies: Iterable[str]) -> int:
+        """批次新增允許的機關，回傳實際新增的數量"""
         try:
-            agencies = self.get_allowed_agencies()
-            if agency not in agencies:
-                agencies.append(agency)
-                self.update_config("content_filter", "allowed_agencies", agencies)
-                return True
-            return False
+            new_agencies = [a for a in dict.fromkeys(agencies) if a not in self._views["allowed_agency_set"]]
+            if new_agencies:
+                self._ensure_content_filter_list("allowed_agencies").extend(new_agencies)
+                self._views["allowed_agency_set"].update(new_agencies)
+                logger.info("新增允許的機關: %s", new_agencies)
+            return len(new_agencies)
         except Exception as e:
-            logger.error(f"新增允許機關時發生錯誤: {e}")
-            return False
+            logger.error("新增允許機關時發生錯誤: %s", e)
+            return 0
     
     def print_config(self):
         """列印當前配置"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         logger.info("=== 當前配置 ===")
-        logger.info(f"內容過濾: {'啟用' if self.is_content_filter_enabled() else '停用'}")
-        logger.info(f"預覽功能: {'啟用' if self.is_preview_enabled() else '停用'}")
+        logger.info("內容過濾: %s", '啟用' if self.is_content_filter_enabled() else '停用')
+        logger.info("預覽功能: %s", '啟用' if self.is_preview_enabled() else '停用')
         
         limits = self.get_content_limits()
-        logger.info(f"內容長度限制: {limits['min_length']} - {limits['max_length']}")
+        logger.info("內容長度限制: %s - %s", limits['min_length'], limits['max_length'])
         
         keywords = self.get_blacklist_keywords()
-        logger.info(f"黑名單關鍵詞: {len(keywords)} 個")
+        logger.info("黑名單關鍵詞: %d 個", len(keywords))
         
         agencies = self.get_allowed_agencies()
         if agencies:
-            logger.info(f"允許的機關: {len(agencies)} 個")
+            logger.info("允許的機關: %d 個", len(agencies))
         else:
             logger.info("允許的機關: 全部")
 
-# 全域配置實例
+# 全域配置實例（建構時不讀檔，首次存取配置時才載入）
 config_loader = ConfigLoader()
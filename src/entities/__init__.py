@@ -7,7 +7,11 @@ from .tender_entities import (
     OrganizationEntity,
     AmountEntity,
     DateEntity,
+    CategoryEntity,
     ContractorEntity,
+    TechnologyEntity,
+    ENTITY_TYPE_MODELS,
+    build_tender_entities_bulk,
 )
 
 __all__ = [
@@ -15,5 +19,9 @@ __all__ = [
     "OrganizationEntity", 
     "AmountEntity",
     "DateEntity",
+    "CategoryEntity",
     "ContractorEntity",
+    "TechnologyEntity",
+    "ENTITY_TYPE_MODELS",
+    "build_tender_entities_bulk",
 ]
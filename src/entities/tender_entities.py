@@ -5,13 +5,13 @@
 擴展版本：增強日期處理、標的分類、關係定義等功能
 """
 
-from typing import Optional, Dict, Any
-from graphiti_core.nodes import EntityNode
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, List, Optional, Type
+from pydantic import BaseModel, Field, TypeAdapter
 
 class TenderCaseEntity(BaseModel):
     """招標案實體 - 擴展版本"""
-    entity_type: str = "TenderCase"
+    entity_type: ClassVar[str] = "TenderCase"
     
     # 原有基本欄位
     tender_id: Optional[str] = Field(None, description="招標案ID")
@@ -44,7 +44,7 @@ class TenderCaseEntity(BaseModel):
 
 class OrganizationEntity(BaseModel):
     """機關實體 - 擴展版本"""
-    entity_type: str = "Organization"
+    entity_type: ClassVar[str] = "Organization"
     
     # 原有基本欄位
     org_name: Optional[str] = Field(None, description="機關名稱")
@@ -60,7 +60,7 @@ class OrganizationEntity(BaseModel):
 
 class AmountEntity(BaseModel):
     """金額實體 - 支援多種金額類型"""
-    entity_type: str = "Amount"
+    entity_type: ClassVar[str] = "Amount"
     
     # 原有基本欄位
     amount_value: Optional[float] = Field(None, description="金額數值")
@@ -84,7 +84,7 @@ class AmountEntity(BaseModel):
 
 class DateEntity(BaseModel):
     """擴展的日期實體 - 支援政府採購網的各種日期類型"""
-    entity_type: str = "Date"
+    entity_type: ClassVar[str] = "Date"
     
     # 原有基本欄位
     date_value: Optional[str] = Field(None, description="日期值")
@@ -107,7 +107,7 @@ class DateEntity(BaseModel):
 
 class CategoryEntity(BaseModel):
     """採購標的分類實體 - 對應政府採購網標準分類"""
-    entity_type: str = "Category"
+    entity_type: ClassVar[str] = "Category"
     
     # 主要分類資訊
     procurement_type: Optional[str] = Field(None, description="採購類型 (工程類/財物類/勞務類)")
@@ -128,51 +128,86 @@ class CategoryEntity(BaseModel):
 
 class ContractorEntity(BaseModel):
     """廠商實體"""
-    entity_type: str = "Contractor"
+    entity_type: ClassVar[str] = "Contractor"
     contractor_name: Optional[str] = Field(None, description="廠商名稱")
     contractor_id: Optional[str] = Field(None, description="廠商統編")
     award_amount: Optional[float] = Field(None, description="得標金額")
 
 class TechnologyEntity(BaseModel):
     """技術實體"""
-    entity_type: str = "Technology"
+    entity_type: ClassVar[str] = "Technology"
     technology_name: Optional[str] = Field(None, description="技術名稱")
     category: Optional[str] = Field(None, description="技術分類")
     domain: Optional[str] = Field(None, description="技術領域")
     description: Optional[str] = Field(None, description="技術描述")
 
+# 實體類型名稱與模型的對應
+ENTITY_TYPE_MODELS: Dict[str, Type[BaseModel]] = {
+    model.entity_type: model
+    for model in (
+        TenderCaseEntity, OrganizationEntity, AmountEntity, DateEntity,
+        CategoryEntity, ContractorEntity, TechnologyEntity,
+    )
+}
+
+@lru_cache(maxsize=None)
+def _entity_list_adapter(entity_type: str) -> TypeAdapter:
+    """取得實體類型的清單驗證器，首次使用時才建立，之後重複使用"""
+    return TypeAdapter(List[ENTITY_TYPE_MODELS[entity_type]])
+
+def build_tender_entities_bulk(
+    entity_type: str,
+    records: List[Dict[str, Any]],
+    validate: bool = True,
+) -> List[BaseModel]:
+    """
+    批次建立同一類型的實體模型
+
+    Args:
+        entity_type (str): 實體類型名稱，如 "TenderCase"、"Amount"
+        records (List[Dict[str, Any]]): 實體屬性字典列表
+        validate (bool): 是否驗證；來源為已解析的可信資料時可設為 False 以略過驗證
+
+    Returns:
+        List[BaseModel]: 實體模型列表
+    """
+    if not validate:
+        model = ENTITY_TYPE_MODELS[entity_type]
+        return [model.model_construct(**record) for record in records]
+    return _entity_list_adapter(entity_type).validate_python(records)
+
 # 新增：關係類型定義
 class RelationshipTypes:
-    """定義實體間的關係類型"""
+    """定義實體間的關係類型（以 frozenset 提供 O(1) 成員檢查）"""
     
     # 機關與標案關係
-    ORG_TENDER_RELATIONS = [
+    ORG_TENDER_RELATIONS = frozenset({
         "hosts",           # 主辦
         "organizes",       # 辦理  
         "supervises",      # 監督
         "participates_in"  # 參與
-    ]
+    })
     
     # 標案與分類關係  
-    TENDER_CATEGORY_RELATIONS = [
+    TENDER_CATEGORY_RELATIONS = frozenset({
         "belongs_to_category",  # 屬於分類
         "has_procurement_type", # 具有採購類型
         "classified_as"         # 被分類為
-    ]
+    })
     
     # 標案與日期關係
-    TENDER_DATE_RELATIONS = [
+    TENDER_DATE_RELATIONS = frozenset({
         "announced_on",         # 公告於
         "opens_bid_on",        # 開標於
         "deadline_on",         # 截止於
         "contract_period",     # 履約期間
         "starts_on",           # 開始於
         "ends_on"              # 結束於
-    ]
+    })
     
     # 標案與金額關係
-    TENDER_AMOUNT_RELATIONS = [
+    TENDER_AMOUNT_RELATIONS = frozenset({
         "has_budget",          # 具有預算
         "has_estimated_cost",  # 具有預計金額
         "awarded_for"          # 決標金額
-    ]
+    })
@@ -4,11 +4,24 @@
 將解析後的招標資料轉換為 Graphiti Episodes，並建立自定義實體類型
 """
 
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from typing import List, Dict, Any, Optional, Set, Union
+from dataclasses import dataclass
+import asyncio
 import re
 import json
 from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # orjson 為選用加速套件，未安裝時退回標準函式庫
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick 為選用加速套件，未安裝時改用逐一子字串比對
+    ahocorasick = None
 
 # 使用 Graphiti 原生格式
 from graphiti_core.nodes import EpisodeType
@@ -19,87 +32,117 @@ from src.entities.tender_entities import (
     DateEntity, CategoryEntity, ContractorEntity, TechnologyEntity
 )
 
-class EntityData(BaseModel):
-    """實體資料結構 - 保留向後兼容性"""
+# 金額清理用正規表達式：移除數字與小數點以外的字元（含逗號）
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+
+# episode 內容中結構不固定的欄位，依輸出順序排列
+_EPISODE_EXTRA_FIELDS = ('agency_info', 'category_info', 'contractor', 'description', 'requirement', 'scope')
+
+# 日期實體欄位：(資料欄位, 日期類型, 屬性名稱, 是否判斷時間資訊；None 表示不設定該屬性)
+_DATE_FIELDS = (
+    ('announcement_date', '公告日期', 'announcement_date', False),
+    ('bid_deadline', '截止投標', 'bid_deadline', True),
+    ('bid_opening_time', '開標時間', 'bid_opening_time', True),
+    ('contract_period', '履約期限', 'contract_period_text', None),
+)
+
+@dataclass(slots=True)
+class EntityData:
+    """實體資料結構 - 保留向後兼容性（欄位皆為純資料且無需驗證，以 slots dataclass 降低建構成本）"""
     entity_type: str
     name: str
     properties: Dict[str, Any]
 
-def extract_amount_value(amount_text: Optional[str]) -> Optional[float]:
+def _drop_none(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """移除值為 None 的屬性"""
+    return {key: value for key, value in properties.items() if value is not None}
+
+def _keep_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """原樣回傳屬性（不移除 None 時使用）"""
+    return properties
+
+def _clean_nested(value: Any) -> Any:
+    """遞迴移除巢狀結構中的 None 與空容器（僅用於結構不固定的外部資料）"""
+    if isinstance(value, dict):
+        return {k: _clean_nested(v) for k, v in value.items() if v is not None and v != {} and v != []}
+    if isinstance(value, list):
+        return [_clean_nested(item) for item in value if item is not None]
+    return value
+
+def extract_amount_value(amount_text: Optional[Union[str, int, float]]) -> Optional[float]:
     """從金額文字中提取數值"""
-    if not amount_text:
+    # 上游已解析為數值時直接轉換，不經過正規表達式
+    if isinstance(amount_text, (int, float)) and not isinstance(amount_text, bool):
+        return float(amount_text)
+    if not amount_text or not isinstance(amount_text, str):
         return None
-    
-    # 移除逗號和非數字字符，保留數字和小數點
-    cleaned = re.sub(r'[^\d.]', '', amount_text.replace(',', ''))
+    return _parse_amount_text(amount_text)
+
+@lru_cache(maxsize=4096)
+def _parse_amount_text(amount_text: str) -> Optional[float]:
+    """解析金額字串（批量資料中常見重複的金額字串，快取解析結果）"""
+    # 單次掃描移除逗號和非數字字符，保留數字和小數點
+    cleaned = _NON_NUMERIC_RE.sub('', amount_text)
     try:
         return float(cleaned) if cleaned else None
     except ValueError:
         return None
 
-def create_graphiti_episode(tender_data: Dict[str, Any]) -> Dict[str, Any]:
+def create_graphiti_episode(tender_data: Dict[str, Any], reference_time: Optional[datetime] = None) -> Dict[str, Any]:
     """
     建立符合 Graphiti 格式的 JSON episode
     
     Args:
         tender_data (Dict[str, Any]): 解析後的招標資料字典
+        reference_time (Optional[datetime]): episode 參考時間，未提供時使用目前時間
     
     Returns:
         Dict[str, Any]: Graphiti episode 配置
     """
-    tender_name = tender_data.get('tender_name', '未知招標案')
+    # 綁定 get 方法為區域變數，省去每個欄位重複的屬性查找
+    get = tender_data.get
+    tender_name = get('tender_name', '未知招標案')
     
-    # 結構化 episode 內容
+    # 結構化 episode 內容；固定結構的區段直接略過 None 以保持資料乾淨
     episode_content = {
-        'tender_info': {
-            'name': tender_data.get('tender_name'),
-            'agency': tender_data.get('agency'),
-            'case_number': tender_data.get('case_number'),
-            'tender_method': tender_data.get('tender_method'),
-            'decision_method': tender_data.get('decision_method'),
-            'procurement_type': tender_data.get('procurement_type'),
-            'tender_stage': tender_data.get('tender_stage'),
-            'performance_location': tender_data.get('performance_location'),
-            'performance_period': tender_data.get('performance_period')
-        },
-        'dates': {
-            'announcement_date': tender_data.get('announcement_date'),
-            'bid_deadline': tender_data.get('bid_deadline'),
-            'bid_opening_time': tender_data.get('bid_opening_time'),
-            'contract_period': tender_data.get('contract_period')
-        },
-        'amounts': {
-            'budget': tender_data.get('budget'),
-            'estimated_amount': tender_data.get('estimated_amount'),
-            'award_amount': tender_data.get('award_amount'),
-            'document_fee': tender_data.get('document_fee'),
-            'system_usage_fee': tender_data.get('system_usage_fee')
-        },
-        'agency_info': tender_data.get('agency_info', {}),
-        'category_info': tender_data.get('category_info', {}),
-        'contractor': tender_data.get('contractor'),
-        'description': tender_data.get('description'),
-        'requirement': tender_data.get('requirement'),
-        'scope': tender_data.get('scope')
+        'tender_info': _drop_none({
+            'name': get('tender_name'),
+            'agency': get('agency'),
+            'case_number': get('case_number'),
+            'tender_method': get('tender_method'),
+            'decision_method': get('decision_method'),
+            'procurement_type': get('procurement_type'),
+            'tender_stage': get('tender_stage'),
+            'performance_location': get('performance_location'),
+            'performance_period': get('performance_period')
+        }),
+        'dates': _drop_none({
+            'announcement_date': get('announcement_date'),
+            'bid_deadline': get('bid_deadline'),
+            'bid_opening_time': get('bid_opening_time'),
+            'contract_period': get('contract_period')
+        }),
+        'amounts': _drop_none({
+            'budget': get('budget'),
+            'estimated_amount': get('estimated_amount'),
+            'award_amount': get('award_amount'),
+            'document_fee': get('document_fee'),
+            'system_usage_fee': get('system_usage_fee')
+        }),
     }
     
-    # 移除空值以保持資料乾淨
-    def clean_dict(d):
-        if isinstance(d, dict):
-            return {k: clean_dict(v) for k, v in d.items() if v is not None and v != {} and v != []}
-        elif isinstance(d, list):
-            return [clean_dict(item) for item in d if item is not None]
-        else:
-            return d
-    
-    episode_content = clean_dict(episode_content)
+    # 其餘欄位可能為外部傳入的巢狀資料，略過空值並只對這些欄位遞迴清理
+    for key in _EPISODE_EXTRA_FIELDS:
+        value = get(key)
+        if value is not None and value != {} and value != []:
+            episode_content[key] = _clean_nested(value)
     
     return {
         'name': f"tender_{tender_name}",
         'episode_body': episode_content,
         'source': EpisodeType.json,
-        'source_description': f"政府採購案 - {tender_data.get('agency', '未知機關')}",
-        'reference_time': datetime.now()
+        'source_description': f"政府採購案 - {get('agency', '未知機關')}",
+        'reference_time': reference_time if reference_time is not None else datetime.now()
     }
 
 def convert_tender_data_to_episodes(tender_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -112,7 +155,7 @@ def convert_tender_data_to_episodes(tender_data: Dict[str, Any]) -> List[Dict[st
     Returns:
         List[Dict[str, Any]]: 轉換後的 Graphiti Episode 列表
     """
-    episodes = []
+    episodes: List[Dict[str, Any]] = []
     
     # 建立主要的招標案 episode
     main_episode = create_graphiti_episode(tender_data)
@@ -120,6 +163,51 @@ def convert_tender_data_to_episodes(tender_data: Dict[str, Any]) -> List[Dict[st
     
     return episodes
 
+# 大數據和 AI 相關關鍵字字典
+TECHNOLOGY_KEYWORDS: Dict[str, List[str]] = {
+    "大數據": ["大數據", "Big Data", "巨量資料", "海量資料"],
+    "人工智慧": ["人工智慧", "AI", "Artificial Intelligence", "機器學習", "Machine Learning", "深度學習", "Deep Learning"],
+    "資料科學": ["資料科學", "Data Science", "數據分析", "資料分析", "Data Analytics"],
+    "雲端運算": ["雲端", "Cloud", "雲端運算", "Cloud Computing", "雲端服務"],
+    "資料倉儲": ["資料倉儲", "Data Warehouse", "數據倉儲", "ETL"],
+    "商業智慧": ["商業智慧", "BI", "Business Intelligence", "決策支援"],
+    "物聯網": ["物聯網", "IoT", "Internet of Things", "感測器"],
+    "區塊鏈": ["區塊鏈", "Blockchain", "分散式帳本"],
+    "資料庫": ["資料庫", "Database", "MySQL", "PostgreSQL", "MongoDB", "NoSQL"],
+    "視覺化": ["視覺化", "Visualization", "圖表", "Dashboard", "儀表板"],
+    "預測分析": ["預測分析", "Predictive Analytics", "預測模型", "統計分析"],
+    "自然語言處理": ["自然語言處理", "NLP", "Natural Language Processing", "文字探勘"],
+}
+
+# 預先小寫化的關鍵字變體，比對時不需再逐一呼叫 lower()
+_TECHNOLOGY_KEYWORDS_LOWERED = tuple(
+    (main_keyword, tuple(variation.lower() for variation in variations))
+    for main_keyword, variations in TECHNOLOGY_KEYWORDS.items()
+)
+
+# 最短的技術關鍵字長度，較短的文字不可能命中任何關鍵字
+_MIN_TECHNOLOGY_KEYWORD_LENGTH = min(
+    len(variation) for variations in TECHNOLOGY_KEYWORDS.values() for variation in variations
+)
+
+# 用於比對技術關鍵字的招標資料文字欄位
+_TECHNOLOGY_TEXT_FIELDS = ('tender_name', 'description', 'requirement', 'scope')
+
+# 歸類為「大數據與AI」領域的主關鍵字（「機器學習」僅為「人工智慧」的變體，不會被回傳，故不列入）
+_BIG_DATA_AI_KEYWORDS = frozenset({"大數據", "人工智慧", "資料科學"})
+
+@lru_cache(maxsize=None)
+def _get_technology_automaton():
+    """建立技術關鍵字的 Aho-Corasick 自動機，未安裝 pyahocorasick 時回傳 None"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for main_keyword, variations in _TECHNOLOGY_KEYWORDS_LOWERED:
+        for variation in variations:
+            automaton.add_word(variation, main_keyword)
+    automaton.make_automaton()
+    return automaton
+
 def extract_technology_keywords(text: str) -> List[str]:
     """
     從文字中提取技術關鍵字，特別針對大數據相關技術
@@ -130,83 +218,100 @@ def extract_technology_keywords(text: str) -> List[str]:
     Returns:
         List[str]: 找到的技術關鍵字列表
     """
-    if not text:
+    if not text or len(text) < _MIN_TECHNOLOGY_KEYWORD_LENGTH:
         return []
     
-    # 大數據和 AI 相關關鍵字字典
-    technology_keywords = {
-        "大數據": ["大數據", "Big Data", "巨量資料", "海量資料"],
-        "人工智慧": ["人工智慧", "AI", "Artificial Intelligence", "機器學習", "Machine Learning", "深度學習", "Deep Learning"],
-        "資料科學": ["資料科學", "Data Science", "數據分析", "資料分析", "Data Analytics"],
-        "雲端運算": ["雲端", "Cloud", "雲端運算", "Cloud Computing", "雲端服務"],
-        "資料倉儲": ["資料倉儲", "Data Warehouse", "數據倉儲", "ETL"],
-        "商業智慧": ["商業智慧", "BI", "Business Intelligence", "決策支援"],
-        "物聯網": ["物聯網", "IoT", "Internet of Things", "感測器"],
-        "區塊鏈": ["區塊鏈", "Blockchain", "分散式帳本"],
-        "資料庫": ["資料庫", "Database", "MySQL", "PostgreSQL", "MongoDB", "NoSQL"],
-        "視覺化": ["視覺化", "Visualization", "圖表", "Dashboard", "儀表板"],
-        "預測分析": ["預測分析", "Predictive Analytics", "預測模型", "統計分析"],
-        "自然語言處理": ["自然語言處理", "NLP", "Natural Language Processing", "文字探勘"],
-    }
+    return extract_technology_keywords_lower(text.lower())
+
+def extract_technology_keywords_lower(text_lower: str) -> List[str]:
+    """
+    從已轉為小寫的文字中提取技術關鍵字，呼叫端已小寫化時可省去重複的 lower()
     
-    found_keywords = []
-    text_lower = text.lower()
+    Args:
+        text_lower (str): 已轉為小寫的文字
+        
+    Returns:
+        List[str]: 找到的技術關鍵字列表
+    """
+    if not text_lower or len(text_lower) < _MIN_TECHNOLOGY_KEYWORD_LENGTH:
+        return []
     
-    for main_keyword, variations in technology_keywords.items():
+    found: Set[str] = set()
+    _collect_technology_keywords(text_lower, found)
+    return _order_technology_keywords(found)
+
+def _collect_technology_keywords(text_lower: str, found: Set[str]) -> None:
+    """將已小寫文字中命中的主關鍵字加入 found（可對多段文字累積）"""
+    automaton = _get_technology_automaton()
+    if automaton is not None:
+        found.update(main_keyword for _, main_keyword in automaton.iter(text_lower))
+        return
+    
+    for main_keyword, variations in _TECHNOLOGY_KEYWORDS_LOWERED:
+        if main_keyword in found:
+            continue
         for variation in variations:
-            if variation.lower() in text_lower:
-                found_keywords.append(main_keyword)
-                break  # 找到一個就跳出，避免重複
-    
-    return list(set(found_keywords))  # 去重
+            if variation in text_lower:
+                found.add(main_keyword)
+                break  # 找到一個就跳出，每個主關鍵字最多加入一次
 
-def create_tender_entities(tender_data: Dict[str, Any]) -> List[EntityData]:
+def _order_technology_keywords(found: Set[str]) -> List[str]:
+    """依關鍵字表順序輸出，結果不受雜湊順序影響"""
+    return [main_keyword for main_keyword, _ in _TECHNOLOGY_KEYWORDS_LOWERED if main_keyword in found]
+
+def create_tender_entities(tender_data: Dict[str, Any], drop_none: bool = False) -> List[EntityData]:
     """
     從招標資料建立自定義實體，支援擴展的實體類型
     包含新的日期類型、分類實體和增強的屬性
 
     Args:
         tender_data (Dict[str, Any]): 解析後的招標資料字典
+        drop_none (bool): 是否在建構時即移除值為 None 的屬性
 
     Returns:
         List[EntityData]: 實體資料列表
     """
-    entities = []
+    # 資料來源為已解析的可信資料（驗證已在解析階段完成），直接建立 EntityData
+    # 只有可能含 None 的屬性字典才經過 prune，日期、技術與承包商屬性不會出現 None
+    prune = _drop_none if drop_none else _keep_properties
+    entities: List[EntityData] = []
+    append_entity = entities.append
+    get = tender_data.get
     
     # 招標案實體 - 擴展版本
-    tender_name = tender_data.get('tender_name')
+    tender_name = get('tender_name')
     if tender_name:
-        entities.append(EntityData(
+        append_entity(EntityData(
             entity_type="TenderCase",
             name=str(tender_name),
-            properties={
-                "tender_id": tender_data.get('tender_id'),
+            properties=prune({
+                "tender_id": get('tender_id'),
                 "tender_name": tender_name,
-                "case_number": tender_data.get('case_number'),
-                "tender_method": tender_data.get('tender_method'),
-                "decision_method": tender_data.get('decision_method'),
-                "procurement_type": tender_data.get('procurement_type'),
-                "tender_stage": tender_data.get('tender_stage'),
-                "announcement_sequence": tender_data.get('announcement_sequence'),
-                "is_multiple_award": tender_data.get('is_multiple_award'),
-                "has_reserve_price": tender_data.get('has_reserve_price'),
-                "subsequent_expansion": tender_data.get('subsequent_expansion'),
-                "is_subsidized": tender_data.get('is_subsidized'),
-                "document_fee": tender_data.get('document_fee'),
-                "system_usage_fee": tender_data.get('system_usage_fee'),
-                "performance_location": tender_data.get('performance_location'),
-                "performance_period": tender_data.get('performance_period')
-            }
+                "case_number": get('case_number'),
+                "tender_method": get('tender_method'),
+                "decision_method": get('decision_method'),
+                "procurement_type": get('procurement_type'),
+                "tender_stage": get('tender_stage'),
+                "announcement_sequence": get('announcement_sequence'),
+                "is_multiple_award": get('is_multiple_award'),
+                "has_reserve_price": get('has_reserve_price'),
+                "subsequent_expansion": get('subsequent_expansion'),
+                "is_subsidized": get('is_subsidized'),
+                "document_fee": get('document_fee'),
+                "system_usage_fee": get('system_usage_fee'),
+                "performance_location": get('performance_location'),
+                "performance_period": get('performance_period')
+            })
         ))
     
     # 機關實體 - 擴展版本
-    agency = tender_data.get('agency')
+    agency = get('agency')
     if agency:
-        agency_info = tender_data.get('agency_info', {})
-        entities.append(EntityData(
+        agency_info = get('agency_info', {})
+        append_entity(EntityData(
             entity_type="Organization",
             name=str(agency),
-            properties={
+            properties=prune({
                 "org_name": agency,
                 "org_code": agency_info.get('org_code'),
                 "org_address": agency_info.get('org_address'),
@@ -215,127 +320,91 @@ def create_tender_entities(tender_data: Dict[str, Any]) -> List[EntityData]:
                 "unit_name": agency_info.get('unit_name'),
                 "contact_fax": agency_info.get('contact_fax'),
                 "contact_email": agency_info.get('contact_email')
-            }
+            })
         ))
     
     # 預算金額實體 - 擴展版本
-    if tender_data.get('budget'):
-        budget_value = extract_amount_value(tender_data.get('budget'))
-        entities.append(EntityData(
+    budget = get('budget')
+    if budget:
+        budget_value = extract_amount_value(budget)
+        append_entity(EntityData(
             entity_type="Amount",
-            name=f"預算金額_{tender_data.get('budget')}",
-            properties={
+            name=f"預算金額_{budget}",
+            properties=prune({
                 "amount_value": budget_value,
-                "amount_text": tender_data.get('budget'),
+                "amount_text": budget,
                 "amount_type": "預算金額",
                 "currency": "TWD",
                 "budget_amount": budget_value,
-                "is_budget_public": tender_data.get('is_budget_public', True),
+                "is_budget_public": get('is_budget_public', True),
                 "tax_included": True
-            }
+            })
         ))
     
     # 預計金額實體（如果與預算金額不同）
-    if tender_data.get('estimated_amount') and tender_data.get('estimated_amount') != tender_data.get('budget'):
-        estimated_value = extract_amount_value(tender_data.get('estimated_amount'))
-        entities.append(EntityData(
+    estimated_amount = get('estimated_amount')
+    if estimated_amount and estimated_amount != budget:
+        estimated_value = extract_amount_value(estimated_amount)
+        append_entity(EntityData(
             entity_type="Amount",
-            name=f"預計金額_{tender_data.get('estimated_amount')}",
-            properties={
+            name=f"預計金額_{estimated_amount}",
+            properties=prune({
                 "amount_value": estimated_value,
-                "amount_text": tender_data.get('estimated_amount'),
+                "amount_text": estimated_amount,
                 "amount_type": "預計金額",
                 "currency": "TWD",
                 "estimated_amount": estimated_value,
-                "is_estimated_public": tender_data.get('is_estimated_public', True),
+                "is_estimated_public": get('is_estimated_public', True),
                 "tax_included": True
-            }
+            })
         ))
     
     # 決標金額實體（如果有）
-    if tender_data.get('award_amount'):
-        award_value = extract_amount_value(tender_data.get('award_amount'))
-        entities.append(EntityData(
+    award_amount = get('award_amount')
+    if award_amount:
+        award_value = extract_amount_value(award_amount)
+        append_entity(EntityData(
             entity_type="Amount",
-            name=f"決標金額_{tender_data.get('award_amount')}",
-            properties={
+            name=f"決標金額_{award_amount}",
+            properties=prune({
                 "amount_value": award_value,
-                "amount_text": tender_data.get('award_amount'),
+                "amount_text": award_amount,
                 "amount_type": "決標金額",
                 "currency": "TWD"
-            }
+            })
         ))
     
     # 日期實體 - 擴展版本，支援多種日期類型
-    
-    # 公告日期
-    if tender_data.get('announcement_date'):
-        entities.append(EntityData(
-            entity_type="Date",
-            name=f"公告日期_{tender_data.get('announcement_date')}",
-            properties={
-                "date_value": tender_data.get('announcement_date'),
-                "date_type": "公告日期",
-                "announcement_date": tender_data.get('announcement_date'),
-                "date_format": "ROC",
-                "has_time_component": False,
-                "timezone": "Asia/Taipei"
-            }
-        ))
-    
-    # 截止投標日期時間
-    if tender_data.get('bid_deadline'):
-        entities.append(EntityData(
-            entity_type="Date",
-            name=f"截止投標_{tender_data.get('bid_deadline')}",
-            properties={
-                "date_value": tender_data.get('bid_deadline'),
-                "date_type": "截止投標",
-                "bid_deadline": tender_data.get('bid_deadline'),
-                "date_format": "ROC",
-                "has_time_component": ":" in str(tender_data.get('bid_deadline', '')),
-                "timezone": "Asia/Taipei"
-            }
-        ))
-    
-    # 開標時間
-    if tender_data.get('bid_opening_time'):
-        entities.append(EntityData(
+    for field, date_type, property_key, check_time in _DATE_FIELDS:
+        date_value = get(field)
+        if not date_value:
+            continue
+        properties = {
+            "date_value": date_value,
+            "date_type": date_type,
+            property_key: date_value,
+            "date_format": "ROC",
+        }
+        if check_time is not None:
+            properties["has_time_component"] = check_time and ":" in (
+                date_value if isinstance(date_value, str) else str(date_value)
+            )
+        properties["timezone"] = "Asia/Taipei"
+        append_entity(EntityData(
             entity_type="Date",
-            name=f"開標時間_{tender_data.get('bid_opening_time')}",
-            properties={
-                "date_value": tender_data.get('bid_opening_time'),
-                "date_type": "開標時間",
-                "bid_opening_time": tender_data.get('bid_opening_time'),
-                "date_format": "ROC",
-                "has_time_component": ":" in str(tender_data.get('bid_opening_time', '')),
-                "timezone": "Asia/Taipei"
-            }
-        ))
-    
-    # 履約期限
-    if tender_data.get('contract_period'):
-        entities.append(EntityData(
-            entity_type="Date",
-            name=f"履約期限_{tender_data.get('contract_period')}",
-            properties={
-                "date_value": tender_data.get('contract_period'),
-                "date_type": "履約期限",
-                "contract_period_text": tender_data.get('contract_period'),
-                "date_format": "ROC",
-                "timezone": "Asia/Taipei"
-            }
+            name=f"{date_type}_{date_value}",
+            properties=properties
         ))
     
     # 新增：分類實體
-    if tender_data.get('category_info'):
-        category_info = tender_data.get('category_info', {})
+    category_info = get('category_info')
+    if category_info:
         category_name = category_info.get('category_name', '未分類')
         
-        entities.append(EntityData(
+        append_entity(EntityData(
             entity_type="Category",
             name=f"分類_{category_name}",
-            properties={
+            properties=prune({
                 "procurement_type": category_info.get('procurement_type'),
                 "category_code": category_info.get('category_code'),
                 "category_name": category_name,
@@ -345,43 +414,59 @@ def create_tender_entities(tender_data: Dict[str, Any]) -> List[EntityData]:
                 "is_electronic_bidding": category_info.get('is_electronic_bidding'),
                 "is_commercial_item": category_info.get('is_commercial_item'),
                 "is_package_deal": category_info.get('is_package_deal')
-            }
+            })
         ))
     
-    # 技術關鍵字實體 - 保持原有功能
-    all_text = " ".join([
-        str(tender_data.get('tender_name', '')),
-        str(tender_data.get('description', '')),
-        str(tender_data.get('requirement', '')),
-        str(tender_data.get('scope', ''))
-    ])
-    
-    tech_keywords = extract_technology_keywords(all_text)
-    for keyword in tech_keywords:
-        entities.append(EntityData(
-            entity_type="Technology",
-            name=keyword,
-            properties={
-                "technology_name": keyword,
-                "category": "資訊科技",
-                "domain": "大數據與AI" if keyword in ["大數據", "人工智慧", "資料科學", "機器學習"] else "資訊技術"
-            }
-        ))
+    # 技術關鍵字實體 - 保持原有功能（逐欄位掃描並合併結果，不另行串接全文）
+    found_keywords: Set[str] = set()
+    for value in map(get, _TECHNOLOGY_TEXT_FIELDS):
+        if not value:
+            continue
+        text = value if isinstance(value, str) else str(value)
+        if len(text) >= _MIN_TECHNOLOGY_KEYWORD_LENGTH:
+            _collect_technology_keywords(text.lower(), found_keywords)
+    if found_keywords:
+        for keyword in _order_technology_keywords(found_keywords):
+            append_entity(EntityData(
+                entity_type="Technology",
+                name=keyword,
+                properties={
+                    "technology_name": keyword,
+                    "category": "資訊科技",
+                    "domain": "大數據與AI" if keyword in _BIG_DATA_AI_KEYWORDS else "資訊技術"
+                }
+            ))
     
     # 承包商實體（如果有決標資訊）
-    if tender_data.get('contractor'):
-        entities.append(EntityData(
+    contractor = get('contractor')
+    if contractor:
+        append_entity(EntityData(
             entity_type="Contractor",
-            name=str(tender_data.get('contractor')),
+            name=str(contractor),
             properties={
-                "contractor_name": tender_data.get('contractor'),
+                "contractor_name": contractor,
                 "contract_type": "得標廠商"
             }
         ))
     
     return entities
 
-async def add_tender_episode_to_graphiti(graphiti_client, tender_data: Dict[str, Any]):
+def create_tender_entities_batch(tender_data_list: List[Dict[str, Any]]) -> List[List[EntityData]]:
+    """
+    批量從多筆招標資料建立自定義實體
+
+    Args:
+        tender_data_list (List[Dict[str, Any]]): 解析後的招標資料列表
+
+    Returns:
+        List[List[EntityData]]: 與輸入順序對應的實體資料列表
+    """
+    # 先建立技術關鍵字自動機，避免首筆資料承擔建構成本；並綁定為區域變數，避免迴圈內重複查找全域名稱
+    _get_technology_automaton()
+    build_entities = create_tender_entities
+    return [build_entities(tender_data) for tender_data in tender_data_list]
+
+async def add_tender_episode_to_graphiti(graphiti_client: Any, tender_data: Dict[str, Any]) -> None:
     """
     將招標 episode 添加到 Graphiti 使用正確的格式
     
@@ -399,21 +484,78 @@ async def add_tender_episode_to_graphiti(graphiti_client, tender_data: Dict[str,
         reference_time=episode_config['reference_time']
     )
 
-async def add_multiple_tender_episodes(graphiti_client, tender_data_list: List[Dict[str, Any]]):
+class EpisodeBulkWriteError(RuntimeError):
+    """分批寫入 episodes 時某一批次失敗；先前已寫入的批次不會回滾"""
+    
+    def __init__(self, completed_chunks: int, total_chunks: int, cause: Exception):
+        super().__init__(
+            f"第 {completed_chunks + 1}/{total_chunks} 批 episodes 處理失敗"
+            f"（前 {completed_chunks} 批已寫入，其後批次未送出）: {cause}"
+        )
+        self.completed_chunks = completed_chunks
+        self.total_chunks = total_chunks
+
+async def add_multiple_tender_episodes(
+    graphiti_client: Any,
+    tender_data_list: List[Dict[str, Any]],
+    chunk_size: int = 64
+) -> None:
     """
     批量添加多個招標 episodes
     
+    各批次依序寫入：Graphiti 的批量寫入只在同一批次內及與既有圖譜去重，
+    並行寫入的批次看不到彼此的結果，會產生重複的機關、類別等節點。
+    前一批寫入期間同時建立下一批的 episodes。
+    
     Args:
         graphiti_client: Graphiti 客戶端實例
         tender_data_list (List[Dict[str, Any]]): 招標資料列表
+        chunk_size (int): 每次批量寫入的 episode 數量
+    
+    Raises:
+        ValueError: chunk_size 小於 1
+        EpisodeBulkWriteError: 某一批建立或寫入失敗，例外中記錄已寫入的批次數
     """
-    episodes = []
-    for tender_data in tender_data_list:
-        episode_config = create_graphiti_episode(tender_data)
-        episodes.append(episode_config)
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size 必須大於等於 1: {chunk_size}")
+    if not tender_data_list:
+        return
+    
+    # 同一批次共用一個參考時間，避免每筆資料各自呼叫 datetime.now()
+    reference_time = datetime.now()
+    total = len(tender_data_list)
+    total_chunks = -(-total // chunk_size)
+    
+    def build_chunk(start: int) -> List[Dict[str, Any]]:
+        return [
+            create_graphiti_episode(tender_data, reference_time)
+            for tender_data in tender_data_list[start:start + chunk_size]
+        ]
     
-    # 使用批量操作提高效能
-    await graphiti_client.add_episode_bulk(episodes)
+    try:
+        chunk = build_chunk(0)
+    except Exception as e:
+        raise EpisodeBulkWriteError(0, total_chunks, e) from e
+    
+    for index in range(total_chunks):
+        send = asyncio.ensure_future(graphiti_client.add_episode_bulk(chunk))
+        # 先讓寫入送出請求，再於等待回應期間建立下一批
+        await asyncio.sleep(0)
+        
+        build_error = None
+        next_start = (index + 1) * chunk_size
+        if next_start < total:
+            try:
+                chunk = build_chunk(next_start)
+            except Exception as e:
+                build_error = e
+        
+        try:
+            await send
+        except Exception as e:
+            raise EpisodeBulkWriteError(index, total_chunks, e) from e
+        if build_error is not None:
+            raise EpisodeBulkWriteError(index + 1, total_chunks, build_error) from build_error
 
 def create_enhanced_fact_triples_entities(tender_data: Dict[str, Any]) -> List[EntityData]:
     """
@@ -426,18 +568,9 @@ def create_enhanced_fact_triples_entities(tender_data: Dict[str, Any]) -> List[E
     Returns:
         List[EntityData]: 優化的實體資料列表
     """
-    entities = create_tender_entities(tender_data)
-    
-    # 為 Fact Triples 方法優化實體屬性
-    for entity in entities:
-        # 確保所有屬性都不是 None，避免 Graphiti 處理問題
-        cleaned_properties = {}
-        for key, value in entity.properties.items():
-            if value is not None:
-                cleaned_properties[key] = value
-        entity.properties = cleaned_properties
-    
-    return entities
+    # 為 Fact Triples 方法優化實體屬性：確保所有屬性都不是 None，避免 Graphiti 處理問題
+    # （於建構時直接移除，不必事後再走訪一次實體列表）
+    return create_tender_entities(tender_data, drop_none=True)
 
 def to_json_string(episode_config: Dict[str, Any]) -> str:
     """
@@ -449,24 +582,25 @@ def to_json_string(episode_config: Dict[str, Any]) -> str:
     Returns:
         str: JSON 字串
     """
-    # 轉換非 JSON 可序列化的物件
-    json_ready_config = episode_config.copy()
-    
-    # 處理 datetime 物件
-    if 'reference_time' in json_ready_config:
-        json_ready_config['reference_time'] = json_ready_config['reference_time'].isoformat()
-    
-    # 處理 EpisodeType 物件
-    if 'source' in json_ready_config:
-        if hasattr(json_ready_config['source'], 'value'):
-            json_ready_config['source'] = json_ready_config['source'].value
-        else:
-            json_ready_config['source'] = str(json_ready_config['source'])
-    
-    return json.dumps(json_ready_config, ensure_ascii=False, indent=2)
+    # datetime 與 EpisodeType 等非 JSON 原生型別交由 _json_default 在序列化時轉換
+    if orjson is not None:
+        return orjson.dumps(
+            episode_config,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(episode_config, ensure_ascii=False, indent=2, default=_json_default)
+
+def _json_default(obj: Any) -> Any:
+    """JSON 序列化的預設轉換：列舉取其值，日期時間轉為 ISO 格式"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 # 示範使用方法
-def example_usage():
+def example_usage() -> Dict[str, Any]:
     """
     示範如何使用新的 Graphiti 格式
     """
@@ -7,13 +7,14 @@ import os
 import sys
 import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import Dict, Any
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 # 添加 src 到路徑
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -30,13 +31,29 @@ from .models import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# API 版本與健康檢查需確認的環境變數
+_VERSION = "0.1.0"
+_ENV_VARS = ("OPENAI_API_KEY", "NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD")
+
+class AppStats:
+    """應用程式統計資訊（以 __slots__ 屬性存放計數器，每次請求更新時免除字典鍵查找）"""
+    
+    __slots__ = (
+        "total_searches", "total_errors", "start_time", "active_sessions",
+        "completed_searches", "total_response_ms"
+    )
+    
+    def __init__(self) -> None:
+        self.total_searches = 0
+        self.total_errors = 0
+        self.start_time = datetime.now()
+        self.active_sessions = 0
+        # 成功完成的搜尋次數與累計耗時（毫秒），供 /stats 計算平均回應時間
+        self.completed_searches = 0
+        self.total_response_ms = 0.0
+
 # 全域變數儲存統計資訊
-app_stats = {
-    "total_searches": 0,
-    "total_errors": 0,
-    "start_time": datetime.now(),
-    "active_sessions": 0
-}
+app_stats = AppStats()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -50,19 +67,24 @@ async def lifespan(app: FastAPI):
         app.state.search_function = search_tenders_async
         logger.info("✅ LangGraph 工作流程載入成功")
     except ImportError as e:
-        logger.error(f"❌ 無法載入 LangGraph 工作流程: {e}")
+        logger.error("❌ 無法載入 LangGraph 工作流程: %s", e)
         app.state.search_function = None
     
     yield
     
     # 關閉時的清理工作
     logger.info("👋 LangGraph + Graphiti 招標搜尋 API 正在關閉...")
+    try:
+        from langgraph_integration.tools.llm_result_processor import close_shared_http_client
+        await close_shared_http_client()
+    except ImportError as e:
+        logger.warning("無法關閉 LLM 共用 HTTP 連線池: %s", e)
 
 # 建立 FastAPI 應用程式
 app = FastAPI(
     title="LangGraph + Graphiti 招標搜尋 API",
     description="提供智能招標搜尋功能的 RESTful API",
-    version="0.1.0",
+    version=_VERSION,
     lifespan=lifespan
 )
 
@@ -78,16 +100,18 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """全域例外處理器"""
-    logger.error(f"未處理的例外: {exc}")
-    app_stats["total_errors"] += 1
+    logger.error("未處理的例外: %s", exc)
+    app_stats.total_errors += 1
     
-    return JSONResponse(
+    # 由 pydantic-core 直接序列化為 JSON，省去 model_dump 後再經 json.dumps 的轉換
+    return Response(
         status_code=500,
         content=ErrorResponse(
             error="internal_server_error",
             message=str(exc),
             timestamp=datetime.now().isoformat()
-        ).model_dump()
+        ).model_dump_json(),
+        media_type="application/json"
     )
 
 @app.get("/", response_model=Dict[str, str])
@@ -95,7 +119,7 @@ async def root():
     """根端點"""
     return {
         "message": "LangGraph + Graphiti 招標搜尋 API",
-        "version": "0.1.0",
+        "version": _VERSION,
         "docs": "/docs",
         "health": "/health"
     }
@@ -108,8 +132,8 @@ async def health_check():
         search_available = hasattr(app.state, 'search_function') and app.state.search_function is not None
         
         # 檢查環境變數
-        env_vars = ["OPENAI_API_KEY", "NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD"]
-        env_status = {var: "✅" if os.getenv(var) else "❌" for var in env_vars}
+        environ = os.environ
+        env_status = {var: "✅" if environ.get(var) else "❌" for var in _ENV_VARS}
         
         dependencies = {
             "langgraph_workflow": "✅" if search_available else "❌",
@@ -121,21 +145,21 @@ async def health_check():
         return HealthResponse(
             status=status,
             timestamp=datetime.now().isoformat(),
-            version="0.1.0",
+            version=_VERSION,
             dependencies=dependencies
         )
     except Exception as e:
-        logger.error(f"健康檢查失敗: {e}")
+        logger.error("健康檢查失敗: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/search", response_model=SearchResponse)
 async def search_tenders(request: SearchRequest):
     """招標搜尋端點"""
+    app_stats.total_searches += 1
+    app_stats.active_sessions += 1
     try:
-        app_stats["total_searches"] += 1
-        app_stats["active_sessions"] += 1
-        
-        start_time = datetime.now()
+        # 以單調時鐘量測耗時，不受系統時間調整影響
+        start_ns = time.perf_counter_ns()
         
         # 檢查搜尋功能是否可用
         if not hasattr(app.state, 'search_function') or app.state.search_function is None:
@@ -144,7 +168,7 @@ async def search_tenders(request: SearchRequest):
                 detail="搜尋功能目前不可用，請檢查 LangGraph 工作流程配置"
             )
         
-        logger.info(f"收到搜尋請求: {request.query}")
+        logger.info("收到搜尋請求: %s", request.query)
         
         # 執行搜尋
         result = await app.state.search_function(
@@ -153,58 +177,60 @@ async def search_tenders(request: SearchRequest):
         )
         
         # 計算執行時間
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        execution_time = (time.perf_counter_ns() - start_ns) / 1_000_000
         
         # 更新結果中的搜尋時間
         if "search_time_ms" in result:
             result["search_time_ms"] = int(execution_time)
         
-        app_stats["active_sessions"] -= 1
+        app_stats.completed_searches += 1
+        app_stats.total_response_ms += execution_time
         
-        logger.info(f"搜尋完成: 找到 {result.get('result_count', 0)} 個結果，耗時 {execution_time:.2f}ms")
+        logger.info("搜尋完成: 找到 %s 個結果，耗時 %.2fms", result.get('result_count', 0), execution_time)
         
         return SearchResponse(**result)
         
     except HTTPException:
-        app_stats["active_sessions"] -= 1
         raise
     except Exception as e:
-        app_stats["active_sessions"] -= 1
-        app_stats["total_errors"] += 1
-        logger.error(f"搜尋過程發生錯誤: {e}")
+        app_stats.total_errors += 1
+        logger.error("搜尋過程發生錯誤: %s", e)
         raise HTTPException(status_code=500, detail=f"搜尋失敗: {str(e)}")
+    finally:
+        app_stats.active_sessions -= 1
 
 @app.get("/stats", response_model=SystemStatsResponse)
 async def get_system_stats():
     """取得系統統計資訊"""
     try:
-        uptime = (datetime.now() - app_stats["start_time"]).total_seconds()
+        uptime = (datetime.now() - app_stats.start_time).total_seconds()
         
-        # 計算平均回應時間 (簡化版本)
-        avg_response_time = 1000 if app_stats["total_searches"] == 0 else 1500
+        # 以成功搜尋的累計耗時計算平均回應時間（毫秒）
+        completed = app_stats.completed_searches
+        avg_response_time = app_stats.total_response_ms / completed if completed else 0.0
         
         # 計算成功率
-        total_requests = app_stats["total_searches"]
+        total_requests = app_stats.total_searches
         success_rate = (
-            (total_requests - app_stats["total_errors"]) / total_requests * 100
+            (total_requests - app_stats.total_errors) / total_requests * 100
             if total_requests > 0 else 100.0
         )
         
         return SystemStatsResponse(
-            total_searches=app_stats["total_searches"],
+            total_searches=app_stats.total_searches,
             average_response_time=avg_response_time,
             success_rate=success_rate,
-            active_sessions=app_stats["active_sessions"],
+            active_sessions=app_stats.active_sessions,
             system_info={
                 "uptime_seconds": uptime,
-                "start_time": app_stats["start_time"].isoformat(),
-                "total_errors": app_stats["total_errors"],
+                "start_time": app_stats.start_time.isoformat(),
+                "total_errors": app_stats.total_errors,
                 "python_version": sys.version,
                 "environment": os.getenv("ENVIRONMENT", "unknown")
             }
         )
     except Exception as e:
-        logger.error(f"獲取統計資訊失敗: {e}")
+        logger.error("獲取統計資訊失敗: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/workflow/info")
@@ -216,7 +242,7 @@ async def get_workflow_info():
     except ImportError:
         raise HTTPException(status_code=503, detail="工作流程資訊不可用")
     except Exception as e:
-        logger.error(f"獲取工作流程資訊失敗: {e}")
+        logger.error("獲取工作流程資訊失敗: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ import os
 import sys
 import logging
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 
 # 添加 src 到路徑
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -14,18 +16,27 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def check_dependencies():
-    """檢查依賴是否已安裝"""
+@lru_cache(maxsize=1)
+def check_dependencies() -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """
+    檢查依賴是否已安裝（結果會被快取，安裝依賴後需呼叫 check_dependencies.cache_clear() 重新檢查）
+    
+    Returns:
+        Tuple[Tuple[str, ...], Dict[str, Any]]: 缺少的依賴，以及已成功載入的模組
+    """
     missing_deps = []
+    modules: Dict[str, Any] = {}
     
     try:
         import fastapi
+        modules["fastapi"] = fastapi
         logger.info("✅ FastAPI 已安裝")
     except ImportError:
         missing_deps.append("fastapi")
     
     try:
         import uvicorn
+        modules["uvicorn"] = uvicorn
         logger.info("✅ Uvicorn 已安裝")
     except ImportError:
         missing_deps.append("uvicorn[standard]")
@@ -36,7 +47,14 @@ def check_dependencies():
     except ImportError as e:
         logger.warning(f"⚠️  LangGraph 工作流程載入問題: {e}")
     
-    return missing_deps
+    if not missing_deps:
+        try:
+            from .server import app
+            modules["server_app"] = app
+        except ImportError as e:
+            logger.warning(f"⚠️  API 服務器載入問題: {e}")
+    
+    return tuple(missing_deps), modules
 
 def install_dependencies(deps):
     """安裝缺少的依賴"""
@@ -47,8 +65,8 @@ def install_dependencies(deps):
     
     import subprocess
     try:
-        for dep in deps:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", dep])
+        # 單次 pip 呼叫安裝全部依賴，省去重複的直譯器與 pip 啟動成本，並讓解析器一次看到所有需求
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *deps])
         return True
     except subprocess.CalledProcessError as e:
         logger.error(f"安裝依賴失敗: {e}")
@@ -58,7 +76,7 @@ def start_server():
     """啟動服務器"""
     try:
         # 檢查並安裝依賴
-        missing = check_dependencies()
+        missing, modules = check_dependencies()
         if missing:
             logger.info("檢測到缺少的依賴，嘗試自動安裝...")
             if not install_dependencies(missing):
@@ -66,12 +84,14 @@ def start_server():
                 for dep in missing:
                     print(f"pip install {dep}")
                 return False
+            
+            # 安裝後清除快取並重新檢查依賴
+            check_dependencies.cache_clear()
+            missing, modules = check_dependencies()
         
-        # 重新檢查依賴
-        try:
-            import uvicorn
-            from .server import app
-        except ImportError:
+        # 直接使用檢查時已載入的模組，不再重複匯入
+        uvicorn = modules.get("uvicorn")
+        if missing or uvicorn is None or "server_app" not in modules:
             logger.error("依賴仍然缺失，無法啟動服務器")
             return False
         
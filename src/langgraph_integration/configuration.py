@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from typing import Annotated
 
 from langchain_core.runnables import ensure_config
 from langgraph.config import get_config
 
+@lru_cache(maxsize=None)
+def _init_field_names(cls: type) -> frozenset[str]:
+    """Return the names of a dataclass's init fields, computed once per class."""
+    return frozenset(f.name for f in fields(cls) if f.init)
+
 @dataclass(kw_only=True)
 class Configuration:
     """The configuration for the tender search agent."""
@@ -62,5 +68,5 @@ class Configuration:
             config = None
         config = ensure_config(config)
         configurable = config.get("configurable") or {}
-        _fields = {f.name for f in fields(cls) if f.init}
+        _fields = _init_field_names(cls)
         return cls(**{k: v for k, v in configurable.items() if k in _fields})
@@ -1,36 +1,46 @@
 import requests
 import uuid
 
+# 共用 Session，多次查詢可重用 HTTP keep-alive 連線
+_SESSION = requests.Session()
+
+# 初始狀態樣板，模組載入時建立一次；除 user_query 與 messages 外的欄位皆相同
+# 注意：淺複製會共用巢狀容器，回傳的狀態僅供序列化送出，請勿就地修改
+_INITIAL_STATE_TEMPLATE = {
+    "user_query": "",
+    "messages": [],
+    "search_results": {
+        "results": [],
+        "total_count": 0,
+        "search_time_ms": 0,
+        "result_quality": 0.0,
+        "metadata": {}
+    },
+    "current_status": "initialized",
+    "should_continue": True,
+    "user_intent": "",
+    "intent_confidence": 0.0,
+    "intent_parameters": {},
+    "current_step": "start",
+    "next_step": "analyze_intent",
+    "error_message": None,
+    "formatted_response": "",
+    "response_type": "text",
+    "refinement_history": [],
+    "needs_refinement": False,
+    "refinement_suggestions": []
+}
+
 def create_initial_state(user_query: str):
-    return {
-        "user_query": user_query,
-        "messages": [
-            {
-                "content": user_query,
-                "type": "human"
-            }
-        ],
-        "search_results": {
-            "results": [],
-            "total_count": 0,
-            "search_time_ms": 0,
-            "result_quality": 0.0,
-            "metadata": {}
-        },
-        "current_status": "initialized",
-        "should_continue": True,
-        "user_intent": "",
-        "intent_confidence": 0.0,
-        "intent_parameters": {},
-        "current_step": "start",
-        "next_step": "analyze_intent",
-        "error_message": None,
-        "formatted_response": "",
-        "response_type": "text",
-        "refinement_history": [],
-        "needs_refinement": False,
-        "refinement_suggestions": []
-    }
+    state = _INITIAL_STATE_TEMPLATE.copy()
+    state["user_query"] = user_query
+    state["messages"] = [
+        {
+            "content": user_query,
+            "type": "human"
+        }
+    ]
+    return state
 
 def run_langgraph_query(base_url: str, thread_id: str, user_query: str):
     url = f"{base_url}/threads/{thread_id}/runs/stream"
@@ -45,15 +55,17 @@ def run_langgraph_query(base_url: str, thread_id: str, user_query: str):
         "stream_mode": ["values"]
     }
 
-    response = requests.post(url, json=payload, stream=True)
-    if response.status_code != 200:
-        print(f"Error: {response.status_code} - {response.text}")
-        return
+    with _SESSION.post(url, json=payload, stream=True) as response:
+        if response.status_code != 200:
+            print(f"Error: {response.status_code} - {response.text}")
+            return
 
-    print("Streaming response:")
-    for line in response.iter_lines():
-        if line:
-            print(line.decode("utf-8"))
+        print("Streaming response:")
+        # 串流回應未必帶 charset，明確指定後由 iter_lines 直接解碼
+        response.encoding = "utf-8"
+        for line in response.iter_lines(chunk_size=16384, decode_unicode=True):
+            if line:
+                print(line)
 
 if __name__ == "__main__":
     BASE_URL = "http://127.0.0.1:8123"
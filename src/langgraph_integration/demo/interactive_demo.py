@@ -4,8 +4,8 @@ LangGraph + Graphiti 招標搜尋系統互動演示
 提供命令列介面來測試智能招標搜尋功能
 """
 
-import asyncio
 import logging
+import time
 from typing import Dict, Any, List
 import sys
 import os
@@ -46,6 +46,17 @@ class TenderSearchDemo:
     def __init__(self):
         self.session_count = 0
         self.search_history = []
+        # 工具於初始化時解析一次，各功能直接查表取得（不可用的工具不會列入）
+        self._tools = {
+            name: tool for name, tool in (
+                ("org", search_tender_by_organization),
+                ("amount", search_tender_by_amount),
+                ("category", search_tender_by_category),
+                ("date", search_tender_by_date_range),
+                ("comprehensive", search_tender_comprehensive),
+                ("stats", get_tender_stats),
+            ) if tool is not None
+        }
 
     def display_banner(self):
         """顯示歡迎橫幅"""
@@ -77,12 +88,13 @@ class TenderSearchDemo:
             "type": search_type,
             "query": query,
             "result_preview": result_preview[:100] + "..." if len(result_preview) > 100 else result_preview,
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": time.monotonic_ns()  # 單調時鐘，不需建立事件迴圈
         })
 
     def search_by_organization(self):
         """根據機關搜尋"""
-        if not TOOLS_AVAILABLE:
+        tool = self._tools.get("org")
+        if tool is None:
             print(" 搜尋工具不可用")
             return
             
@@ -93,10 +105,7 @@ class TenderSearchDemo:
 
         print(f" 搜尋機關「{org_name}」的招標案...")
         try:
-            if search_tender_by_organization is None:
-                result = " 搜尋工具不可用"
-            else:
-                result = search_tender_by_organization(org_name)
+            result = tool(org_name)
             print("\n 搜尋結果:")
             print(result)
             self.record_search("機關搜尋", org_name, result)
@@ -105,7 +114,8 @@ class TenderSearchDemo:
 
     def search_by_amount(self):
         """根據金額範圍搜尋"""
-        if not TOOLS_AVAILABLE:
+        tool = self._tools.get("amount")
+        if tool is None:
             print(" 搜尋工具不可用")
             return
             
@@ -123,13 +133,10 @@ class TenderSearchDemo:
 
         print(f" 搜尋金額範圍 {min_amount}-{max_amount}萬 的招標案...")
         try:
-            if search_tender_by_amount is None:
-                result = " 搜尋工具不可用"
-            else:
-                result = search_tender_by_amount.invoke({
-                    "min_amount": min_amount,
-                    "max_amount": max_amount
-                })
+            result = tool.invoke({
+                "min_amount": min_amount,
+                "max_amount": max_amount
+            })
             print("\n 搜尋結果:")
             print(result)
             self.record_search("金額搜尋", f"{min_amount}-{max_amount}萬", result)
@@ -138,7 +145,8 @@ class TenderSearchDemo:
 
     def search_by_category(self):
         """根據類別搜尋"""
-        if not TOOLS_AVAILABLE:
+        tool = self._tools.get("category")
+        if tool is None:
             print(" 搜尋工具不可用")
             return
             
@@ -149,10 +157,7 @@ class TenderSearchDemo:
 
         print(f" 搜尋類別「{category}」的招標案...")
         try:
-            if search_tender_by_category is None:
-                result = " 搜尋工具不可用"
-            else:
-                result = search_tender_by_category(category)
+            result = tool(category)
             print("\n 搜尋結果:")
             print(result)
             self.record_search("類別搜尋", category, result)
@@ -161,7 +166,8 @@ class TenderSearchDemo:
 
     def search_by_date_range(self):
         """根據日期範圍搜尋"""
-        if not TOOLS_AVAILABLE:
+        tool = self._tools.get("date")
+        if tool is None:
             print(" 搜尋工具不可用")
             return
             
@@ -174,13 +180,10 @@ class TenderSearchDemo:
 
         print(f"🔍 搜尋日期範圍 {start_date} 到 {end_date} 的招標案...")
         try:
-            if search_tender_by_date_range is None:
-                result = " 搜尋工具不可用"
-            else:
-                result = search_tender_by_date_range.invoke({
-                    "start_date": start_date,
-                    "end_date": end_date
-                })
+            result = tool.invoke({
+                "start_date": start_date,
+                "end_date": end_date
+            })
             print("\n 搜尋結果:")
             print(result)
             self.record_search("日期搜尋", f"{start_date} 到 {end_date}", result)
@@ -189,7 +192,8 @@ class TenderSearchDemo:
 
     def search_comprehensive(self):
         """綜合搜尋"""
-        if not TOOLS_AVAILABLE:
+        tool = self._tools.get("comprehensive")
+        if tool is None:
             print(" 搜尋工具不可用")
             return
             
@@ -200,10 +204,7 @@ class TenderSearchDemo:
 
         print(f"🔍 綜合搜尋「{query}」...")
         try:
-            if search_tender_comprehensive is None:
-                result = " 搜尋工具不可用"
-            else:
-                result = search_tender_comprehensive(query)
+            result = tool(query)
             print("\n 搜尋結果:")
             print(result)
             self.record_search("綜合搜尋", query, result)
@@ -212,16 +213,14 @@ class TenderSearchDemo:
 
     def show_system_stats(self):
         """顯示系統統計"""
-        if not TOOLS_AVAILABLE:
+        tool = self._tools.get("stats")
+        if tool is None:
             print(" 搜尋工具不可用")
             return
             
         print(" 正在獲取系統統計資訊...")
         try:
-            if get_tender_stats is None:
-                stats = " 搜尋工具不可用"
-            else:
-                stats = get_tender_stats.invoke({})
+            stats = tool.invoke({})
             print("\n 系統統計:")
             print(stats)
         except Exception as e:
@@ -250,6 +249,17 @@ class TenderSearchDemo:
 
         self.display_banner()
 
+        # 選單對應表於迴圈外建立一次，以查表取代逐一比對的 if/elif
+        menu = {
+            "1": self.search_by_organization,
+            "2": self.search_by_amount,
+            "3": self.search_by_category,
+            "4": self.search_by_date_range,
+            "5": self.search_comprehensive,
+            "6": self.show_system_stats,
+            "7": self.show_search_history,
+        }
+
         while True:
             try:
                 print("\n" + "=" * 30)
@@ -258,22 +268,12 @@ class TenderSearchDemo:
                 if choice == "0":
                     print(" 感謝使用！再見！")
                     break
-                elif choice == "1":
-                    self.search_by_organization()
-                elif choice == "2":
-                    self.search_by_amount()
-                elif choice == "3":
-                    self.search_by_category()
-                elif choice == "4":
-                    self.search_by_date_range()
-                elif choice == "5":
-                    self.search_comprehensive()
-                elif choice == "6":
-                    self.show_system_stats()
-                elif choice == "7":
-                    self.show_search_history()
-                else:
+
+                action = menu.get(choice)
+                if action is None:
                     print(" 無效選項，請選擇 0-7")
+                else:
+                    action()
 
             except KeyboardInterrupt:
                 print("\n\n 收到中斷信號，退出系統...")
@@ -5,10 +5,17 @@
 
 import logging
 import re
+import threading
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick 為選用加速套件，未安裝時改用逐一子字串比對
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 class QueryIntent(Enum):
@@ -20,7 +27,7 @@ class QueryIntent(Enum):
     COMPREHENSIVE = "comprehensive"  # 綜合搜尋
     UNKNOWN = "unknown"           # 未知意圖
 
-@dataclass
+@dataclass(slots=True)
 class IntentAnalysisResult:
     """意圖分析結果"""
     intent: QueryIntent
@@ -35,28 +42,39 @@ class QueryIntentAnalyzer:
     def __init__(self):
         self.setup_patterns()
         self.setup_keywords()
+        # 最高分意圖只由查詢字串決定，重複查詢時直接取用快取結果（每個實例各自快取）
+        self._best_intent = lru_cache(maxsize=1024)(self._compute_best_intent)
     
     def setup_patterns(self):
-        """設定匹配模式"""
+        """設定匹配模式（於初始化時預先編譯，查詢時直接使用編譯後的模式）"""
+        # 機關名稱字面詞彙：每組對應一個機關模式，組內順序即正規表達式交替的比對順序
+        self.org_name_groups = [
+            ('台灣電力', '台電力', '台電', '電力公司'),
+            ('中華郵政', '郵局'),
+            ('交通部', '運輸署', '公路總局'),
+            ('教育部', '學校', '大學', '國小', '國中', '高中'),
+            ('衛生福利部', '衛福利部', '醫院', '衛生局'),
+            ('內政部', '警察', '消防'),
+            ('財政部', '稅務', '國稅局'),
+            ('經濟部', '工業局', '商業司'),
+            ('勞動部', '勞工'),
+            ('環保署', '環境部'),
+            ('水利署', '水公司'),
+            ('市政府', '縣政府', '區公所', '鄉公所'),
+        ]
+        # 通用機關名稱模式（非字面詞彙，仍以正規表達式比對）
+        self._org_generic_re = re.compile(r'(\w+公司|\w+機構|\w+單位|\w+部門)', re.IGNORECASE)
+        
         # 機關名稱模式
         self.org_patterns = [
-            r'(台灣?電力|台電|電力公司)',
-            r'(中華郵政|郵局)',
-            r'(交通部|運輸署|公路總局)',
-            r'(教育部|學校|大學|國小|國中|高中)',
-            r'(衛生?福利部|醫院|衛生局)',
-            r'(內政部|警察|消防)',
-            r'(財政部|稅務|國稅局)',
-            r'(經濟部|工業局|商業司)',
-            r'(勞動部|勞工)',
-            r'(環保署|環境部)',
-            r'(水利署|水公司)',
-            r'(市政府|縣政府|區公所|鄉公所)',
-            r'(\w+公司|\w+機構|\w+單位|\w+部門)'
+            re.compile('(' + '|'.join(map(re.escape, group)) + ')', re.IGNORECASE)
+            for group in self.org_name_groups
         ]
+        self.org_patterns.append(self._org_generic_re)
+        self._org_automaton = self._build_org_automaton(self.org_name_groups)
         
         # 金額模式
-        self.amount_patterns = [
+        self.amount_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in (
             r'(\d+(?:[,，]\d+)*)\s*(?:萬|万)',
             r'(\d+(?:[,，]\d+)*)\s*(?:元|塊)',
             r'預算\s*(?:在|為|是|約|大約)?\s*(\d+(?:[,，]\d+)*)',
@@ -65,10 +83,10 @@ class QueryIntentAnalyzer:
             r'(?:超過|大於|>)\s*(\d+(?:[,，]\d+)*)',
             r'(?:小於|少於|<)\s*(\d+(?:[,，]\d+)*)',
             r'(?:以上|以下)\s*(\d+(?:[,，]\d+)*)'
-        ]
+        )]
         
         # 類別模式
-        self.category_patterns = [
+        self.category_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in (
             r'(電腦|資訊|軟體|系統|網路|IT)',
             r'(建築|工程|營建|土木|裝修)',
             r'(醫療|藥品|醫療器材|健康)',
@@ -83,10 +101,10 @@ class QueryIntentAnalyzer:
             r'(維修|保養|服務|技術)',
             r'(研究|開發|創新|科技)',
             r'(設計|規劃|顧問|諮詢)'
-        ]
+        )]
         
         # 日期模式
-        self.date_patterns = [
+        self.date_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in (
             r'(\d{4})[年/\-](\d{1,2})[月/\-](\d{1,2})[日號]?',
             r'(\d{1,2})[月/\-](\d{1,2})[日號]?',
             r'(今年|去年|前年|明年)',
@@ -95,7 +113,26 @@ class QueryIntentAnalyzer:
             r'(\d+)\s*(?:天|日|周|週|月|年)\s*(?:內|前|後)',
             r'(\d{4})\s*年',
             r'(\d{1,2})\s*月'
-        ]
+        )]
+        
+        # 不含 \d 的模式，查詢沒有任何數字時只需比對這些模式
+        self._digit_re = re.compile(r'\d')
+        # 任一文字字元（含中文）；查詢只有數字與符號時，機關與類別模式必定不符合
+        self._letter_re = re.compile(r'[^\W\d_]')
+        self._digit_free_amount_patterns = [p for p in self.amount_patterns if r'\d' not in p.pattern]
+        self._digit_free_date_patterns = [p for p in self.date_patterns if r'\d' not in p.pattern]
+        
+        # 參數提取專用模式
+        self._amount_range_re = re.compile(r'(\d+(?:[,，]\d+)*)\s*(?:到|至|~|－|-)\s*(\d+(?:[,，]\d+)*)')
+        self._full_date_re = re.compile(r'(\d{4})[年/\-](\d{1,2})[月/\-](\d{1,2})[日號]?')
+        self._year_month_re = re.compile(r'(\d{4})[年/\-](\d{1,2})[月/\-]')
+        self._gte_re = re.compile('以上|超過|大於|>')
+        self._lte_re = re.compile('以下|小於|少於|<')
+        self._search_verb_re = re.compile('找|搜尋|查詢|尋找')
+        self._org_keyword_res = {
+            keyword: re.compile(rf'(\w+){keyword}|\w+{keyword}(\w+)')
+            for keyword in ('機關', '單位', '部門', '公司', '政府')
+        }
     
     def setup_keywords(self):
         """設定關鍵字"""
@@ -117,6 +154,41 @@ class QueryIntentAnalyzer:
                 '本月', '上月', '公告', '截止', '期限', '時程'
             ]
         }
+        self._keyword_automaton = self._build_keyword_automaton(self.intent_keywords)
+    
+    @staticmethod
+    def _build_keyword_automaton(intent_keywords: Dict[QueryIntent, List[str]]):
+        """建立意圖關鍵字的 Aho-Corasick 自動機，單次掃描即可找出所有命中的關鍵字（未安裝 pyahocorasick 時回傳 None）"""
+        if ahocorasick is None:
+            return None
+        owners: Dict[str, List[QueryIntent]] = {}
+        for intent, keywords in intent_keywords.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, []).append(intent)
+        automaton = ahocorasick.Automaton()
+        for keyword, intents in owners.items():
+            automaton.add_word(keyword, (keyword, tuple(intents)))
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _build_org_automaton(org_name_groups: List[Tuple[str, ...]]):
+        """建立機關名稱字面詞彙的 Aho-Corasick 自動機，值為 (組別, 組內順序, 詞彙)（未安裝 pyahocorasick 時回傳 None）"""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for group_index, group in enumerate(org_name_groups):
+            for order, name in enumerate(group):
+                automaton.add_word(name, (group_index, order, name))
+        automaton.make_automaton()
+        return automaton
+    
+    def _match_org_names(self, query: str) -> List[Tuple[int, int, int, str]]:
+        """單次掃描找出所有命中的機關名稱字面詞彙，回傳 (組別, 起始位置, 組內順序, 詞彙)"""
+        return [
+            (group_index, end - len(name) + 1, order, name)
+            for end, (group_index, order, name) in self._org_automaton.iter(query)
+        ]
     
     def analyze_intent(self, query: str) -> IntentAnalysisResult:
         """分析查詢意圖"""
@@ -130,15 +202,11 @@ class QueryIntentAnalyzer:
                 suggestions=["請輸入您想搜尋的內容"]
             )
         
-        # 分析各種意圖的可能性
-        intent_scores = self._calculate_intent_scores(query)
-        
-        # 找到最高分的意圖
-        best_intent = max(intent_scores.items(), key=lambda x: x[1])
-        intent_type, confidence = best_intent
+        # 分析各種意圖的可能性，找到最高分的意圖
+        intent_type, confidence, first_value = self._best_intent(query)
         
-        # 提取相應的參數
-        parameters = self._extract_parameters(query, intent_type)
+        # 提取相應的參數（重用計分時的模式擷取值；日期參數與當下時間有關，不納入快取）
+        parameters = self._extract_parameters(query, intent_type, first_value)
         
         # 生成解釋和建議
         reasoning = self._generate_reasoning(query, intent_type, confidence, parameters)
@@ -152,66 +220,112 @@ class QueryIntentAnalyzer:
             suggestions=suggestions
         )
     
+    def _compute_best_intent(self, query: str) -> Tuple[QueryIntent, float, Optional[str]]:
+        """計算最高分的意圖、其信心度，以及該意圖在計分時第一個符合模式的擷取值"""
+        intent_scores, first_values = self._score_query(query)
+        intent_type, confidence = max(intent_scores.items(), key=lambda x: x[1])
+        return intent_type, confidence, first_values.get(intent_type)
+    
     def _calculate_intent_scores(self, query: str) -> Dict[QueryIntent, float]:
         """計算各種意圖的分數"""
+        return self._score_query(query)[0]
+    
+    def _score_query(self, query: str) -> Tuple[Dict[QueryIntent, float], Dict[QueryIntent, str]]:
+        """計算各種意圖的分數，並記錄機關、金額、類別第一個符合模式的 group(1)，供參數提取重用"""
         scores = {intent: 0.0 for intent in QueryIntent}
+        first_values: Dict[QueryIntent, str] = {}
         query_lower = query.lower()
         
-        # 基於關鍵字的分數計算
-        for intent, keywords in self.intent_keywords.items():
-            keyword_count = sum(1 for keyword in keywords if keyword in query_lower)
-            scores[intent] += keyword_count * 0.3
+        # 基於關鍵字的分數計算（每個意圖依命中的不同關鍵字數計分）
+        automaton = self._keyword_automaton
+        if automaton is not None:
+            keyword_counts: Dict[QueryIntent, int] = {}
+            for _, intents in {value for _, value in automaton.iter(query_lower)}:
+                for intent in intents:
+                    keyword_counts[intent] = keyword_counts.get(intent, 0) + 1
+            for intent, keyword_count in keyword_counts.items():
+                scores[intent] += keyword_count * 0.3
+        else:
+            for intent, keywords in self.intent_keywords.items():
+                keyword_count = sum(1 for keyword in keywords if keyword in query_lower)
+                scores[intent] += keyword_count * 0.3
         
         # 基於模式匹配的分數計算
         
-        # 機關模式匹配
-        for pattern in self.org_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                scores[QueryIntent.ORGANIZATION] += 0.5
+        # 先判斷查詢是否含文字與數字：機關與類別模式都需要文字，金額與多數日期模式需要數字
+        has_letter = self._letter_re.search(query) is not None
+        has_digit = self._digit_re.search(query) is not None
+        
+        # 機關模式匹配（字面詞彙以自動機單次掃描，每個命中的組別計分一次）
+        if has_letter:
+            if self._org_automaton is not None:
+                # 與依序搜尋各模式相同：取最前面的組別，組內取最左側、同位置取交替順序在前者
+                hits = self._match_org_names(query)
+                if hits:
+                    first_values[QueryIntent.ORGANIZATION] = min(hits)[3]
+                for _ in {hit[0] for hit in hits}:
+                    scores[QueryIntent.ORGANIZATION] += 0.5
+                match = self._org_generic_re.search(query)
+                if match:
+                    first_values.setdefault(QueryIntent.ORGANIZATION, match.group(1))
+                    scores[QueryIntent.ORGANIZATION] += 0.5
+            else:
+                for pattern in self.org_patterns:
+                    match = pattern.search(query)
+                    if match:
+                        first_values.setdefault(QueryIntent.ORGANIZATION, match.group(1))
+                        scores[QueryIntent.ORGANIZATION] += 0.5
         
         # 金額模式匹配
-        for pattern in self.amount_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
+        for pattern in self.amount_patterns if has_digit else self._digit_free_amount_patterns:
+            match = pattern.search(query)
+            if match:
+                first_values.setdefault(QueryIntent.AMOUNT, match.group(1))
                 scores[QueryIntent.AMOUNT] += 0.4
         
         # 類別模式匹配
-        for pattern in self.category_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
+        for pattern in self.category_patterns if has_letter else ():
+            match = pattern.search(query)
+            if match:
+                first_values.setdefault(QueryIntent.CATEGORY, match.group(1))
                 scores[QueryIntent.CATEGORY] += 0.3
         
         # 日期模式匹配
-        for pattern in self.date_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
+        for pattern in self.date_patterns if has_digit else self._digit_free_date_patterns:
+            if pattern.search(query):
                 scores[QueryIntent.DATE] += 0.4
         
+        # 最高分只計算一次，後續由此推得，不再重複掃描分數字典
+        max_score = max(scores.values())
+        
         # 特殊規則調整
-        if any(word in query_lower for word in ['找', '搜尋', '查詢', '尋找']):
+        if max_score < 0.3 and self._search_verb_re.search(query_lower):
             # 如果包含搜尋詞但沒有明確意圖，提高綜合搜尋分數
-            if max(scores.values()) < 0.3:
-                scores[QueryIntent.COMPREHENSIVE] += 0.4
+            scores[QueryIntent.COMPREHENSIVE] += 0.4
+            max_score = max(max_score, scores[QueryIntent.COMPREHENSIVE])
         
-        # 正規化分數
-        max_score = max(scores.values())
+        # 正規化分數（正規化為單調函數，正規化後的最高分即最高分本身正規化的結果）
         if max_score > 0:
-            for intent in scores:
-                scores[intent] = min(scores[intent] / (max_score + 0.1), 1.0)
+            divisor = max_score + 0.1
+            scores = {intent: min(score / divisor, 1.0) for intent, score in scores.items()}
+            max_score = min(max_score / divisor, 1.0)
         
         # 如果所有分數都很低，設為未知意圖
-        if max(scores.values()) < 0.2:
+        if max_score < 0.2:
             scores[QueryIntent.UNKNOWN] = 0.8
         
-        return scores
+        return scores, first_values
     
-    def _extract_parameters(self, query: str, intent: QueryIntent) -> Dict[str, Any]:
-        """根據意圖提取參數"""
+    def _extract_parameters(self, query: str, intent: QueryIntent, first_value: Optional[str]) -> Dict[str, Any]:
+        """根據意圖提取參數（first_value 為計分時該意圖第一個符合模式的擷取值）"""
         parameters = {}
         
         if intent == QueryIntent.ORGANIZATION:
-            parameters.update(self._extract_organization_params(query))
+            parameters.update(self._extract_organization_params(query, first_value))
         elif intent == QueryIntent.AMOUNT:
-            parameters.update(self._extract_amount_params(query))
+            parameters.update(self._extract_amount_params(query, first_value))
         elif intent == QueryIntent.CATEGORY:
-            parameters.update(self._extract_category_params(query))
+            parameters.update(self._extract_category_params(query, first_value))
         elif intent == QueryIntent.DATE:
             parameters.update(self._extract_date_params(query))
         elif intent == QueryIntent.COMPREHENSIVE:
@@ -219,25 +333,20 @@ class QueryIntentAnalyzer:
         
         return parameters
     
-    def _extract_organization_params(self, query: str) -> Dict[str, Any]:
-        """提取機關相關參數"""
+    def _extract_organization_params(self, query: str, org_name: Optional[str]) -> Dict[str, Any]:
+        """提取機關相關參數（org_name 為計分時第一個符合機關模式的名稱）"""
         params = {}
         
-        # 嘗試匹配機關名稱
-        for pattern in self.org_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                params['organization_name'] = match.group(1)
-                break
+        # 機關名稱模式已在計分時比對過，直接使用其結果
+        if org_name is not None:
+            params['organization_name'] = org_name
         
         # 如果沒有找到具體機關名稱，嘗試提取通用詞彙
         if 'organization_name' not in params:
-            org_keywords = ['機關', '單位', '部門', '公司', '政府']
-            for keyword in org_keywords:
+            for keyword, pattern in self._org_keyword_res.items():
                 if keyword in query:
                     # 嘗試找到機關名稱前後的文字
-                    pattern = rf'(\w+){keyword}|\w+{keyword}(\w+)'
-                    match = re.search(pattern, query)
+                    match = pattern.search(query)
                     if match:
                         org_name = match.group(1) or match.group(2)
                         if org_name:
@@ -246,13 +355,12 @@ class QueryIntentAnalyzer:
         
         return params
     
-    def _extract_amount_params(self, query: str) -> Dict[str, Any]:
-        """提取金額相關參數"""
+    def _extract_amount_params(self, query: str, amount_text: Optional[str]) -> Dict[str, Any]:
+        """提取金額相關參數（amount_text 為計分時第一個符合金額模式的數字）"""
         params = {}
         
         # 提取金額範圍
-        range_pattern = r'(\d+(?:[,，]\d+)*)\s*(?:到|至|~|－|-)\s*(\d+(?:[,，]\d+)*)'
-        range_match = re.search(range_pattern, query)
+        range_match = self._amount_range_re.search(query)
         if range_match:
             min_amount = float(range_match.group(1).replace(',', '').replace('，', ''))
             max_amount = float(range_match.group(2).replace(',', '').replace('，', ''))
@@ -260,39 +368,33 @@ class QueryIntentAnalyzer:
             params['max_amount'] = max_amount
             return params
         
-        # 提取單一金額
-        for pattern in self.amount_patterns:
-            match = re.search(pattern, query)
-            if match:
-                amount_str = match.group(1).replace(',', '').replace('，', '')
-                try:
-                    amount = float(amount_str)
-                    
-                    # 判斷是上限還是下限
-                    if any(word in query for word in ['以上', '超過', '大於', '>']):
-                        params['min_amount'] = amount
-                    elif any(word in query for word in ['以下', '小於', '少於', '<']):
-                        params['max_amount'] = amount
-                    else:
-                        # 預設為範圍搜尋，上下浮動20%
-                        params['min_amount'] = amount * 0.8
-                        params['max_amount'] = amount * 1.2
-                    break
-                except ValueError:
-                    continue
+        # 提取單一金額（金額模式已在計分時比對過，直接使用其結果）
+        if amount_text is not None:
+            amount_str = amount_text.replace(',', '').replace('，', '')
+            try:
+                amount = float(amount_str)
+            except ValueError:
+                return params
+            
+            # 判斷是上限還是下限
+            if self._gte_re.search(query):
+                params['min_amount'] = amount
+            elif self._lte_re.search(query):
+                params['max_amount'] = amount
+            else:
+                # 預設為範圍搜尋，上下浮動20%
+                params['min_amount'] = amount * 0.8
+                params['max_amount'] = amount * 1.2
         
         return params
     
-    def _extract_category_params(self, query: str) -> Dict[str, Any]:
-        """提取類別相關參數"""
+    def _extract_category_params(self, query: str, category: Optional[str]) -> Dict[str, Any]:
+        """提取類別相關參數（category 為計分時第一個符合類別模式的詞彙）"""
         params = {}
         
-        # 嘗試匹配具體類別
-        for pattern in self.category_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                params['category'] = match.group(1)
-                break
+        # 類別模式已在計分時比對過，直接使用其結果
+        if category is not None:
+            params['category'] = category
         
         # 如果沒有找到具體類別，使用整個查詢作為類別
         if 'category' not in params:
@@ -311,7 +413,7 @@ class QueryIntentAnalyzer:
         params = {}
         
         # 完整日期匹配
-        date_match = re.search(r'(\d{4})[年/\-](\d{1,2})[月/\-](\d{1,2})[日號]?', query)
+        date_match = self._full_date_re.search(query)
         if date_match:
             year, month, day = date_match.groups()
             params['start_date'] = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
@@ -319,7 +421,7 @@ class QueryIntentAnalyzer:
             return params
         
         # 年月匹配
-        year_month_match = re.search(r'(\d{4})[年/\-](\d{1,2})[月/\-]', query)
+        year_month_match = self._year_month_re.search(query)
         if year_month_match:
             year, month = year_month_match.groups()
             params['start_date'] = f"{year}-{month.zfill(2)}-01"
@@ -382,8 +484,24 @@ class QueryIntentAnalyzer:
         
         return suggestions
 
-# 全域分析器實例
-analyzer = QueryIntentAnalyzer()
+# 全域分析器實例（延遲建立，僅匯入 QueryIntent 等定義時不必編譯所有模式）
+_analyzer: Optional[QueryIntentAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+def get_intent_analyzer() -> QueryIntentAnalyzer:
+    """獲取意圖分析器實例（執行緒安全的單例模式）"""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = QueryIntentAnalyzer()
+    return _analyzer
+
+def __getattr__(name: str) -> Any:
+    """相容原本的模組屬性 analyzer，首次存取時才建立分析器"""
+    if name == "analyzer":
+        return get_intent_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def analyze_user_intent(query: str) -> IntentAnalysisResult:
     """
@@ -395,4 +513,4 @@ def analyze_user_intent(query: str) -> IntentAnalysisResult:
     Returns:
         IntentAnalysisResult: 分析結果
     """
-    return analyzer.analyze_intent(query)
+    return get_intent_analyzer().analyze_intent(query)
@@ -6,37 +6,168 @@ LLM 結果處理器
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import json
 import os
+import threading
+import httpx
 from openai import AsyncOpenAI
+from graphiti_core.edges import EntityEdge
+from graphiti_core.nodes import EntityNode
+
+try:
+    import orjson
+except ImportError:  # orjson 為選用加速套件，未安裝時退回標準函式庫
+    orjson = None
+
+try:
+    import h2
+except ImportError:  # h2 為選用加速套件，未安裝時以 HTTP/1.1 連線
+    h2 = None
 
 logger = logging.getLogger(__name__)
 
-class LLMResultProcessor:
-    """LLM 結果處理器，用於智能分析和格式化搜尋結果"""
-    
-    def __init__(self):
-        self.client = None
-        self.model_name = os.getenv("OPENAI_MODEL_NAME", "gpt-4")
-        self._initialize_openai_client()
-    
-    def _initialize_openai_client(self):
-        """初始化 OpenAI 客戶端"""
-        try:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if api_key:
-                self.client = AsyncOpenAI(api_key=api_key)
-                logger.info("成功初始化 OpenAI 客戶端")
-            else:
-                logger.warning("未找到 OPENAI_API_KEY，LLM 處理器將使用降級模式")
-        except Exception as e:
-            logger.error(f"初始化 OpenAI 客戶端失敗: {e}")
+# OpenAI 請求的逾時秒數與重試次數（明確設定，避免使用 SDK 預設值）
+_REQUEST_TIMEOUT = 30.0
+_MAX_RETRIES = 2
+
+# 單次請求的提示詞長度上限（字元數），可由環境變數調整
+_DEFAULT_MAX_PROMPT_CHARS = 24000
+
+def _read_max_prompt_chars() -> int:
+    """讀取提示詞長度上限，環境變數不是正整數時記錄警告並使用預設值"""
+    raw = os.getenv("LLM_MAX_PROMPT_CHARS", "").strip()
+    if not raw:
+        return _DEFAULT_MAX_PROMPT_CHARS
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value <= 0:
+        logger.warning("LLM_MAX_PROMPT_CHARS 設定值無效: %r，使用預設值 %s", raw, _DEFAULT_MAX_PROMPT_CHARS)
+        return _DEFAULT_MAX_PROMPT_CHARS
+    return value
+
+_MAX_PROMPT_CHARS = _read_max_prompt_chars()
+
+# 合併請求每次最多包含的工作數，max_tokens 依此上限（每個區段 800）計算
+_MAX_JOBS_PER_BATCH = 4
+
+# 提示詞過長而略過 LLM 分析時，附加在基本格式化結果前的說明
+_PROMPT_TOO_LARGE_NOTE = "（搜尋結果過多，提示詞超過長度上限，已略過 LLM 分析，以下為基本整理結果）\n\n"
+
+# 全域共用的 HTTP 連線池，讓所有 OpenAI 請求重用已建立的 keep-alive 連線
+_shared_http_client: Optional[httpx.AsyncClient] = None
+_shared_http_client_lock = threading.Lock()
+
+def _get_shared_http_client() -> httpx.AsyncClient:
+    """取得共用的 HTTP 客戶端（已安裝 h2 時啟用 HTTP/2 多工，執行緒安全的延遲建立）"""
+    global _shared_http_client
+    if _shared_http_client is None:
+        with _shared_http_client_lock:
+            if _shared_http_client is None:
+                _shared_http_client = httpx.AsyncClient(
+                    http2=h2 is not None,
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                    timeout=_REQUEST_TIMEOUT
+                )
+    return _shared_http_client
+
+# 每個搜尋結果都會嘗試帶入的通用屬性
+_COMMON_ATTRS = ('uuid', 'created_at')
+_MISSING = object()
+
+# 送往 LLM 的文字欄位長度上限（Graphiti 的摘要與關係描述可能長達數 KB）
+_MAX_FIELD_LEN = {
+    'fact': 400,
+    'summary': 300,
+    'name': 120,
+    'source_entity': 120,
+    'target_entity': 120,
+}
+
+def _pack_entity_edge(result: EntityEdge) -> Dict[str, Any]:
+    """整理 EntityEdge（關係邊）"""
+    return {'type': 'entity_edge', 'fact': result.fact}
+
+def _pack_entity_node(result: EntityNode) -> Dict[str, Any]:
+    """整理 EntityNode（實體節點）"""
+    return {'name': result.name, 'type': 'entity', 'summary': result.summary}
+
+def _pack_generic(result: Any) -> Dict[str, Any]:
+    """整理其他類型的搜尋結果（依屬性判斷類型）"""
+    result_info = {}
     
-    def _get_search_type_prompt(self, search_type: str, query_params: Dict[str, Any]) -> str:
-        """根據搜尋類型獲取對應的提示詞"""
+    # 處理 EntityEdge（關係邊）
+    if type(result).__name__ == 'EntityEdge':
+        result_info['type'] = 'entity_edge'
+        
+        # 嘗試獲取關係資訊
+        if hasattr(result, 'fact'):
+            result_info['fact'] = result.fact
+        
+        # 嘗試獲取相關實體資訊
+        if hasattr(result, 'source_node') and result.source_node:
+            source = result.source_node
+            if hasattr(source, 'name'):
+                result_info['source_entity'] = source.name
+            if hasattr(source, 'entity_type'):
+                result_info['source_type'] = source.entity_type
+        
+        if hasattr(result, 'target_node') and result.target_node:
+            target = result.target_node
+            if hasattr(target, 'name'):
+                result_info['target_entity'] = target.name
+            if hasattr(target, 'entity_type'):
+                result_info['target_type'] = target.entity_type
+        
+        # 嘗試獲取關係類型
+        if hasattr(result, 'relation_type'):
+            result_info['relation_type'] = result.relation_type
+            
+    # 處理 Entity（實體節點）
+    elif hasattr(result, 'name'):
+        result_info['name'] = result.name
+        result_info['type'] = 'entity'
         
-        base_instruction = """你是一個政府招標案智能分析助手。請分析以下 Graphiti 知識圖譜的搜尋結果，並提供清晰、有用的回答。
+        if hasattr(result, 'summary'):
+            result_info['summary'] = result.summary
+        if hasattr(result, 'entity_type'):
+            result_info['entity_type'] = result.entity_type
+            
+    # 處理其他類型（如純關係）
+    elif hasattr(result, 'fact'):
+        result_info['fact'] = result.fact
+        result_info['type'] = 'relationship'
+    
+    return result_info
+
+# 搜尋結果類別與整理函式的對照表（以 type() 精確比對，子類別走通用路徑）
+_RESULT_HANDLERS = {
+    EntityEdge: _pack_entity_edge,
+    EntityNode: _pack_entity_node,
+}
+
+def _dump_results_json(data: List[Dict[str, Any]]) -> str:
+    """將整理後的搜尋結果序列化為提示詞中的精簡 JSON 文字（兩種路徑輸出相同，不含縮排空白）"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+def _parse_json_object(content: str) -> Dict[str, Any]:
+    """解析 LLM 回覆中的 JSON 物件，容許前後的 ```json 程式碼區塊標記或說明文字"""
+    start = content.find('{')
+    end = content.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("LLM 回應中找不到 JSON 物件")
+    payload = content[start:end + 1]
+    data = orjson.loads(payload) if orjson is not None else json.loads(payload)
+    if not isinstance(data, dict):
+        raise ValueError("LLM 回應的 JSON 不是物件")
+    return data
+
+# 提示詞共用的基本指示
+_BASE_INSTRUCTION = """你是一個政府招標案智能分析助手。請分析以下 Graphiti 知識圖譜的搜尋結果，並提供清晰、有用的回答。
 
 重要原則：
 1. 盡力從關係和實體資訊中提取有用內容
@@ -52,14 +183,14 @@ class LLMResultProcessor:
 - 即使只有關係資訊，也要嘗試組合推斷可能的招標案內容
 
 """
-        
-        if search_type == "organization":
-            org_name = query_params.get("organization_name", "")
-            return base_instruction + f"""
+
+# 各搜尋類型的提示詞區段
+_SEARCH_TYPE_SECTIONS = {
+    "organization": """
 搜尋類型：機關搜尋
-查詢機關：{org_name}
+查詢機關：{organization_name}
 
-**任務：從搜尋結果中找出與「{org_name}」相關的招標案**
+**任務：從搜尋結果中找出與「{organization_name}」相關的招標案**
 
 機關匹配規則：
 - "台電" → "台灣電力股份有限公司"、"台電"、"電力公司"
@@ -70,31 +201,27 @@ class LLMResultProcessor:
 
 **重點指示：**
 1. 仔細檢查每個搜尋結果中的機關資訊
-2. 如果關係資訊中提到「招標機關是{org_name}」，那就是相關招標案
-3. 如果實體名稱包含{org_name}的招標案，也要列出
+2. 如果關係資訊中提到「招標機關是{organization_name}」，那就是相關招標案
+3. 如果實體名稱包含{organization_name}的招標案，也要列出
 4. 從關係描述中提取招標案的完整名稱
 5. 不要忽略已經找到的相關資訊
 
 分析方法：
-- 查看 fact 欄位中是否提到「招標機關是{org_name}」
+- 查看 fact 欄位中是否提到「招標機關是{organization_name}」
 - 查看實體名稱是否包含招標案相關關鍵字
 - 將相關的關係資訊組合成完整的招標案描述
 
 回應格式：
-找到以下與「{org_name}」相關的招標案：
+找到以下與「{organization_name}」相關的招標案：
 
 1. 招標案名稱：[從關係或實體中提取的完整招標案名稱]
-   機關：{org_name}
+   機關：{organization_name}
    金額：[如果有金額資訊]
    描述：[根據搜尋結果組合的描述]
 
-**注意：如果搜尋結果中明確提到某招標案的機關是{org_name}，一定要列出來！**
-"""
-        
-        elif search_type == "amount":
-            min_amount = query_params.get("min_amount", 0)
-            max_amount = query_params.get("max_amount", 0)
-            return base_instruction + f"""
+**注意：如果搜尋結果中明確提到某招標案的機關是{organization_name}，一定要列出來！**
+""",
+    "amount": """
 搜尋類型：金額範圍搜尋
 金額範圍：{min_amount}-{max_amount}萬元
 
@@ -111,11 +238,8 @@ class LLMResultProcessor:
    機關：[機關名稱]
    金額：[具體金額]萬元
    描述：[描述]
-"""
-        
-        elif search_type == "category":
-            category = query_params.get("category", "")
-            return base_instruction + f"""
+""",
+    "category": """
 搜尋類型：類別搜尋
 搜尋類別：{category}
 
@@ -131,11 +255,8 @@ class LLMResultProcessor:
    金額：[金額]
    相關性：[說明為什麼與{category}相關]
    描述：[描述]
-"""
-        
-        elif search_type == "comprehensive":
-            query = query_params.get("query", "")
-            return base_instruction + f"""
+""",
+    "comprehensive": """
 搜尋類型：綜合搜尋
 查詢關鍵字：{query}
 
@@ -164,12 +285,66 @@ class LLMResultProcessor:
    描述：[根據搜尋結果組合的完整描述]
 
 **如果沒有找到直接匹配，才顯示其他相關資訊。**
-"""
-        
-        else:
-            return base_instruction + """
+""",
+}
+
+# 各範本代入的查詢參數及其預設值
+_PROMPT_PARAM_DEFAULTS = {
+    "organization": {"organization_name": ""},
+    "amount": {"min_amount": 0, "max_amount": 0},
+    "category": {"category": ""},
+    "comprehensive": {"query": ""},
+}
+
+# 其他搜尋類型使用的通用提示詞區段
+_DEFAULT_SECTION = """
 請分析以下搜尋結果，提取有用的招標案資訊並整理成清晰的格式。
 """
+
+# 單一請求使用的完整提示詞範本（模組載入時即與基本指示合併，呼叫時只需代入查詢參數）
+_SEARCH_TYPE_PROMPTS = {
+    search_type: _BASE_INSTRUCTION + section for search_type, section in _SEARCH_TYPE_SECTIONS.items()
+}
+_DEFAULT_PROMPT = _BASE_INSTRUCTION + _DEFAULT_SECTION
+
+def _render_prompt(templates: Dict[str, str], default: str, search_type: str, query_params: Dict[str, Any]) -> str:
+    """依搜尋類型選用範本並代入查詢參數"""
+    template = templates.get(search_type)
+    if template is None:
+        return default
+    return template.format(**{
+        name: query_params.get(name, default_value)
+        for name, default_value in _PROMPT_PARAM_DEFAULTS[search_type].items()
+    })
+
+class LLMResultProcessor:
+    """LLM 結果處理器，用於智能分析和格式化搜尋結果"""
+    
+    def __init__(self):
+        self.client = None
+        self.model_name = os.getenv("OPENAI_MODEL_NAME", "gpt-4")
+        self._initialize_openai_client()
+    
+    def _initialize_openai_client(self):
+        """初始化 OpenAI 客戶端"""
+        try:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if api_key:
+                self.client = AsyncOpenAI(
+                    api_key=api_key,
+                    http_client=_get_shared_http_client(),
+                    timeout=_REQUEST_TIMEOUT,
+                    max_retries=_MAX_RETRIES
+                )
+                logger.info("成功初始化 OpenAI 客戶端")
+            else:
+                logger.warning("未找到 OPENAI_API_KEY，LLM 處理器將使用降級模式")
+        except Exception as e:
+            logger.error(f"初始化 OpenAI 客戶端失敗: {e}")
+    
+    def _get_search_type_prompt(self, search_type: str, query_params: Dict[str, Any]) -> str:
+        """根據搜尋類型獲取對應的提示詞"""
+        return _render_prompt(_SEARCH_TYPE_PROMPTS, _DEFAULT_PROMPT, search_type, query_params)
     
     async def process_search_results(
         self, 
@@ -193,6 +368,10 @@ class LLMResultProcessor:
             # 降級到基本格式化
             return self._fallback_formatting(results, search_type, query_params)
         
+        # 沒有結果或只有一個非關係結果時，直接使用基本格式化省去一次 API 往返
+        if not self._needs_llm(results):
+            return self._fallback_formatting(results, search_type, query_params)
+        
         try:
             # 準備搜尋結果數據（限制數量以避免上下文超限）
             results_data = self._prepare_results_data(results)
@@ -204,11 +383,16 @@ class LLMResultProcessor:
             # 構建用戶訊息（簡化格式）
             user_message = f"""
 搜尋結果數據（前{len(limited_results_data)}個結果）：
-{json.dumps(limited_results_data, ensure_ascii=False, indent=1)}
+{_dump_results_json(limited_results_data)}
 
 請根據上述搜尋結果，按照指示提供清晰的分析和回答。
 """
             
+            # 提示詞超過長度上限時不送出請求，改用基本格式化
+            if len(system_prompt) + len(user_message) > _MAX_PROMPT_CHARS:
+                logger.warning("提示詞長度超過上限 %s 字元，改用基本格式化", _MAX_PROMPT_CHARS)
+                return _PROMPT_TOO_LARGE_NOTE + self._fallback_formatting(results, search_type, query_params)
+            
             # 調用 LLM（使用環境變數中的模型名稱）
             response = await self.client.chat.completions.create(
                 model=self.model_name,
@@ -227,64 +411,135 @@ class LLMResultProcessor:
             logger.error(f"LLM 處理搜尋結果時發生錯誤: {e}")
             return self._fallback_formatting(results, search_type, query_params)
     
+    @staticmethod
+    def _needs_llm(results: List[Any]) -> bool:
+        """沒有結果或只有一個非關係結果時，LLM 無可分析，直接使用基本格式化即可"""
+        return bool(results) and not (len(results) == 1 and not hasattr(results[0], 'fact'))
+    
+    async def process_batched(self, jobs: List[Tuple[List[Any], str, Dict[str, Any]]]) -> List[str]:
+        """
+        將多個搜尋結果處理工作合併為 LLM 請求（每個請求最多 _MAX_JOBS_PER_BATCH 個工作）
+        
+        目前為選用介面，搜尋工具仍各自呼叫 process_search_results；需要一次處理多筆查詢時再改用此方法。
+        
+        Args:
+            jobs: (搜尋結果, 搜尋類型, 查詢參數) 的清單
+            
+        Returns:
+            與 jobs 順序相同的格式化結果；合併請求失敗的區段改為逐一處理
+        """
+        
+        if not self.client:
+            return [self._fallback_formatting(*job) for job in jobs]
+        
+        outputs: List[Optional[str]] = [None] * len(jobs)
+        pending = []
+        for index, job in enumerate(jobs):
+            if self._needs_llm(job[0]):
+                pending.append(index)
+            else:
+                outputs[index] = self._fallback_formatting(*job)
+        
+        batches = [pending[start:start + _MAX_JOBS_PER_BATCH] for start in range(0, len(pending), _MAX_JOBS_PER_BATCH)]
+        batch_outputs = await asyncio.gather(*(self._process_batch([jobs[i] for i in batch]) for batch in batches))
+        for batch, texts in zip(batches, batch_outputs):
+            for index, text in zip(batch, texts):
+                outputs[index] = text
+        return outputs
+    
+    async def _process_batch(self, jobs: List[Tuple[List[Any], str, Dict[str, Any]]]) -> List[str]:
+        """以單一 LLM 請求處理一批工作，無法取得有效回答的區段改為逐一處理"""
+        
+        if len(jobs) == 1:
+            return [await self.process_search_results(*jobs[0])]
+        
+        section_ids = [f"S{i}" for i in range(1, len(jobs) + 1)]
+        
+        # 基本指示只出現一次，各工作的指示與搜尋結果以區段代號標示
+        system_parts = [_BASE_INSTRUCTION, "\n本次請求包含多個獨立區段，請分別依各區段的指示回答。\n"]
+        user_parts = []
+        for section_id, (results, search_type, query_params) in zip(section_ids, jobs):
+            system_parts.append(f"\n# 區段 {section_id}\n")
+            system_parts.append(_render_prompt(_SEARCH_TYPE_SECTIONS, _DEFAULT_SECTION, search_type, query_params))
+            limited_results_data = self._prepare_results_data(results)[:10]
+            user_parts.append(f"""
+# 區段 {section_id} 搜尋結果數據（前{len(limited_results_data)}個結果）：
+{_dump_results_json(limited_results_data)}
+""")
+        system_parts.append(
+            f"\n請以 JSON 物件回覆，鍵為區段代號（{'、'.join(section_ids)}），值為該區段的完整回答文字（字串）。\n"
+        )
+        system_prompt = "".join(system_parts)
+        user_message = "".join(user_parts)
+        
+        # 合併後的提示詞超過長度上限時不送出，改為逐一處理（各自再套用長度上限）
+        if len(system_prompt) + len(user_message) > _MAX_PROMPT_CHARS:
+            logger.warning("合併提示詞長度超過上限 %s 字元，改為逐一處理", _MAX_PROMPT_CHARS)
+            return list(await asyncio.gather(*(self.process_search_results(*job) for job in jobs)))
+        
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                temperature=0.1,
+                max_tokens=800 * len(jobs)
+            )
+            answers = _parse_json_object(response.choices[0].message.content or "")
+        except Exception as e:
+            logger.error("合併 LLM 請求失敗，改為逐一處理: %s", e)
+            return list(await asyncio.gather(*(self.process_search_results(*job) for job in jobs)))
+        
+        outputs: List[Optional[str]] = []
+        failed = []
+        for index, section_id in enumerate(section_ids):
+            answer = answers.get(section_id)
+            if isinstance(answer, str) and answer.strip():
+                outputs.append(answer.strip())
+            else:
+                outputs.append(None)
+                failed.append(index)
+        
+        # 只有缺少或格式不符的區段才逐一處理
+        if failed:
+            logger.warning("合併 LLM 回應缺少有效區段 %s，改為逐一處理", [section_ids[i] for i in failed])
+            retried = await asyncio.gather(*(self.process_search_results(*jobs[i]) for i in failed))
+            for index, text in zip(failed, retried):
+                outputs[index] = text
+        return outputs
+    
     def _prepare_results_data(self, results: List[Any]) -> List[Dict[str, Any]]:
         """準備搜尋結果數據供 LLM 分析"""
         prepared_data = []
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
         for result in results:
-            result_info = {}
-            result_type = type(result).__name__
+            result_class = type(result)
             
-            # 處理 EntityEdge（關係邊）
-            if result_type == 'EntityEdge':
-                result_info['type'] = 'entity_edge'
-                
-                # 嘗試獲取關係資訊
-                if hasattr(result, 'fact'):
-                    result_info['fact'] = result.fact
-                
-                # 嘗試獲取相關實體資訊
-                if hasattr(result, 'source_node') and result.source_node:
-                    source = result.source_node
-                    if hasattr(source, 'name'):
-                        result_info['source_entity'] = source.name
-                    if hasattr(source, 'entity_type'):
-                        result_info['source_type'] = source.entity_type
-                
-                if hasattr(result, 'target_node') and result.target_node:
-                    target = result.target_node
-                    if hasattr(target, 'name'):
-                        result_info['target_entity'] = target.name
-                    if hasattr(target, 'entity_type'):
-                        result_info['target_type'] = target.entity_type
-                
-                # 嘗試獲取關係類型
-                if hasattr(result, 'relation_type'):
-                    result_info['relation_type'] = result.relation_type
-                    
-            # 處理 Entity（實體節點）
-            elif hasattr(result, 'name'):
-                result_info['name'] = result.name
-                result_info['type'] = 'entity'
-                
-                if hasattr(result, 'summary'):
-                    result_info['summary'] = result.summary
-                if hasattr(result, 'entity_type'):
-                    result_info['entity_type'] = result.entity_type
-                    
-            # 處理其他類型（如純關係）
-            elif hasattr(result, 'fact'):
-                result_info['fact'] = result.fact
-                result_info['type'] = 'relationship'
+            # 已知的 Graphiti 類別直接分派至對應函式，其他類型逐一檢查屬性
+            result_info = _RESULT_HANDLERS.get(result_class, _pack_generic)(result)
             
             # 添加通用屬性
-            for attr in ['uuid', 'created_at']:
-                if hasattr(result, attr):
-                    result_info[attr] = str(getattr(result, attr))
+            for attr in _COMMON_ATTRS:
+                value = getattr(result, attr, _MISSING)
+                if value is not _MISSING:
+                    result_info[attr] = str(value)
             
-            # 添加調試資訊
-            result_info['debug_type'] = result_type
-            result_info['debug_attributes'] = [attr for attr in dir(result) if not attr.startswith('_')]
+            # 截斷過長的文字欄位並移除空值，減少送往 LLM 的 token 數
+            for field, max_len in _MAX_FIELD_LEN.items():
+                value = result_info.get(field)
+                if isinstance(value, str) and len(value) > max_len:
+                    result_info[field] = value[:max_len]
+            result_info = {key: value for key, value in result_info.items() if value is not None and value != ''}
+            
+            # 調試資訊只寫入本地日誌，不送往 LLM（dir() 成本高，僅在啟用 DEBUG 日誌時列出屬性）
+            if debug_enabled:
+                logger.debug(
+                    "搜尋結果類型 %s，屬性: %s",
+                    result_class.__name__, [attr for attr in dir(result) if not attr.startswith('_')]
+                )
             
             if result_info:  # 只添加非空的結果
                 prepared_data.append(result_info)
@@ -332,10 +587,26 @@ class LLMResultProcessor:
 
 # 全域實例
 _llm_processor = None
+_llm_processor_lock = threading.Lock()
 
 def get_llm_processor() -> LLMResultProcessor:
-    """獲取 LLM 處理器實例（單例模式）"""
+    """獲取 LLM 處理器實例（執行緒安全的單例模式）"""
     global _llm_processor
     if _llm_processor is None:
-        _llm_processor = LLMResultProcessor()
+        with _llm_processor_lock:
+            if _llm_processor is None:
+                _llm_processor = LLMResultProcessor()
     return _llm_processor
+
+async def close_shared_http_client() -> None:
+    """關閉共用的 HTTP 客戶端（應用程式關閉時呼叫）
+
+    同時重置 LLM 處理器單例，之後再取得處理器時會建立新的連線池，不會沿用已關閉的客戶端。
+    """
+    global _shared_http_client, _llm_processor
+    with _llm_processor_lock, _shared_http_client_lock:
+        client = _shared_http_client
+        _shared_http_client = None
+        _llm_processor = None
+    if client is not None:
+        await client.aclose()
@@ -4,13 +4,23 @@
 """
 
 import logging
+import re
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 金額字串中的數字模式（模組載入時預先編譯）
+_AMOUNT_RE = re.compile(r'[\d,]+\.?\d*')
+
+# 格式化輸出用的分隔線（模組載入時建立一次）
+_SEP = "\n" + "-" * 60 + "\n\n"
+_HEADER_LINE = "=" * 40 + "\n\n"
+_SUMMARY_LINE = "=" * 30 + "\n\n"
+_TABLE_LINE = "=" * 50 + "\n\n"
+
+@dataclass(slots=True)
 class TenderResult:
     """招標結果數據類別"""
     tender_id: Optional[str] = None
@@ -38,104 +48,111 @@ class TenderResultFormatter:
             return "未找到符合條件的招標案"
         
         # 限制顯示結果數量
-        display_results = results[:self.max_results_display]
-        
-        formatted_text = f"找到 {len(results)} 個招標案"
-        if len(results) > self.max_results_display:
-            formatted_text += f"（顯示前 {self.max_results_display} 個）"
-        formatted_text += "：\n\n"
-        
+        max_display = self.max_results_display
+        display_results = results[:max_display]
+        
+        parts = [f"找到 {len(results)} 個招標案"]
+        if len(results) > max_display:
+            parts.append(f"（顯示前 {max_display} 個）")
+        parts.append("：\n\n")
+        
+        # 迴圈內使用的方法先綁定為區域變數
+        parse_result = self._parse_result_to_tender
+        format_tender = self._format_single_tender
+        append = parts.append
         for i, result in enumerate(display_results, 1):
-            tender_result = self._parse_result_to_tender(result)
-            formatted_text += self._format_single_tender(tender_result, i)
-            formatted_text += "\n" + "-" * 60 + "\n\n"
+            append(format_tender(parse_result(result), i))
+            append(_SEP)
         
-        return formatted_text
+        return "".join(parts)
     
     def format_detailed_result(self, result: Dict[str, Any]) -> str:
         """格式化單一招標案的詳細資訊"""
         tender_result = self._parse_result_to_tender(result)
         
-        details = "📋 招標案詳細資訊\n"
-        details += "=" * 40 + "\n\n"
+        details = ["📋 招標案詳細資訊\n", _HEADER_LINE]
         
         if tender_result.tender_name:
-            details += f" 招標案名稱：{tender_result.tender_name}\n\n"
+            details.append(f" 招標案名稱：{tender_result.tender_name}\n\n")
         
         if tender_result.agency:
-            details += f" 招標機關：{tender_result.agency}\n\n"
+            details.append(f" 招標機關：{tender_result.agency}\n\n")
         
         if tender_result.amount:
-            details += f" 預算金額：{tender_result.amount}\n\n"
+            details.append(f" 預算金額：{tender_result.amount}\n\n")
         
         if tender_result.category:
-            details += f" 採購類別：{tender_result.category}\n\n"
+            details.append(f" 採購類別：{tender_result.category}\n\n")
         
         if tender_result.announcement_date:
-            details += f" 公告日期：{tender_result.announcement_date}\n\n"
+            details.append(f" 公告日期：{tender_result.announcement_date}\n\n")
         
         if tender_result.deadline:
-            details += f" 截止日期：{tender_result.deadline}\n\n"
+            details.append(f" 截止日期：{tender_result.deadline}\n\n")
         
         if tender_result.status:
-            details += f" 狀態：{tender_result.status}\n\n"
+            details.append(f" 狀態：{tender_result.status}\n\n")
         
         if tender_result.description:
-            details += f" 描述：\n{tender_result.description}\n\n"
+            details.append(f" 描述：\n{tender_result.description}\n\n")
         
         if tender_result.contact_info:
-            details += f" 聯絡資訊：\n{tender_result.contact_info}\n\n"
+            details.append(f" 聯絡資訊：\n{tender_result.contact_info}\n\n")
         
-        return details
+        return "".join(details)
     
     def format_summary_statistics(self, results: List[Dict[str, Any]]) -> str:
         """格式化搜尋結果統計摘要"""
         if not results:
             return "無搜尋結果統計"
         
-        # 統計各種資訊
+        # 統計各種資訊（只需三個欄位，直接讀取原始字典，不建立 TenderResult）
         agencies = set()
         categories = set()
         total_amount = 0
         amount_count = 0
+        extract_amount = self._extract_amount_number
         
         for result in results:
-            tender_result = self._parse_result_to_tender(result)
-            
-            if tender_result.agency:
-                agencies.add(tender_result.agency)
+            agency = result.get('agency')
+            if agency:
+                agencies.add(agency)
             
-            if tender_result.category:
-                categories.add(tender_result.category)
+            category = result.get('category')
+            if category:
+                categories.add(category)
             
             # 嘗試提取金額數字進行統計
-            if tender_result.amount:
-                amount_num = self._extract_amount_number(tender_result.amount)
+            amount = result.get('amount')
+            if amount:
+                amount_num = extract_amount(amount)
                 if amount_num:
                     total_amount += amount_num
                     amount_count += 1
         
-        summary = "📊 搜尋結果統計摘要\n"
-        summary += "=" * 30 + "\n\n"
-        summary += f"📈 總招標案數：{len(results)}\n"
-        summary += f"🏢 涉及機關數：{len(agencies)}\n"
-        summary += f"📂 採購類別數：{len(categories)}\n"
+        summary = [
+            "📊 搜尋結果統計摘要\n",
+            _SUMMARY_LINE,
+            f"📈 總招標案數：{len(results)}\n",
+            f"🏢 涉及機關數：{len(agencies)}\n",
+            f"📂 採購類別數：{len(categories)}\n",
+        ]
         
         if amount_count > 0:
             avg_amount = total_amount / amount_count
-            summary += f"💰 平均預算：{avg_amount:.1f}萬\n"
+            summary.append(f"💰 平均預算：{avg_amount:.1f}萬\n")
         
         if agencies:
-            summary += f"\n🏢 主要機關：\n"
+            summary.append("\n🏢 主要機關：\n")
             for agency in list(agencies)[:5]:  # 顯示前5個機關
-                summary += f"   • {agency}\n"
+                summary.append(f"   • {agency}\n")
         
         if categories:
-            summary += f"\n📂 主要類別：\n"
+            summary.append("\n📂 主要類別：\n")
             for category in list(categories)[:5]:  # 顯示前5個類別
-                summary += f"   • {category}\n"
+                summary.append(f"   • {category}\n")
         
-        return summary
+        return "".join(summary)
     
     def format_comparison_table(self, results: List[Dict[str, Any]]) -> str:
         """格式化為比較表格（簡化版）"""
@@ -145,17 +162,18 @@ class TenderResultFormatter:
         # 限制比較結果數量
         compare_results = results[:5]
         
-        table = "📋 招標案比較表\n"
-        table += "=" * 50 + "\n\n"
+        table = ["📋 招標案比較表\n", _TABLE_LINE]
         
         for i, result in enumerate(compare_results, 1):
             tender_result = self._parse_result_to_tender(result)
-            table += f"{i}. {tender_result.tender_name or '未知招標案'}\n"
-            table += f"   機關：{tender_result.agency or '未知'}\n"
-            table += f"   金額：{tender_result.amount or '未知'}\n"
-            table += f"   類別：{tender_result.category or '未知'}\n\n"
-        
-        return table
+            table.append(
+                f"{i}. {tender_result.tender_name or '未知招標案'}\n"
+                f"   機關：{tender_result.agency or '未知'}\n"
+                f"   金額：{tender_result.amount or '未知'}\n"
+                f"   類別：{tender_result.category or '未知'}\n\n"
+            )
+        
+        return "".join(table)
     
     def _parse_result_to_tender(self, result: Dict[str, Any]) -> TenderResult:
         """將原始結果解析為 TenderResult 物件"""
@@ -174,62 +192,56 @@ class TenderResultFormatter:
     
     def _format_single_tender(self, tender: TenderResult, index: int) -> str:
         """格式化單一招標案資訊"""
-        formatted = f"{index}. "
-        
         # 招標案名稱
-        if tender.tender_name:
-            formatted += f"**{tender.tender_name}**\n"
-        else:
-            formatted += "**未知招標案**\n"
+        fragments = [f"{index}. **{tender.tender_name or '未知招標案'}**\n"]
         
         # 機關資訊
         if tender.agency:
-            formatted += f"   🏢 機關：{tender.agency}\n"
+            fragments.append(f"   🏢 機關：{tender.agency}\n")
         
         # 金額資訊
         if tender.amount:
-            formatted += f"   💰 金額：{tender.amount}\n"
+            fragments.append(f"   💰 金額：{tender.amount}\n")
         
         # 類別資訊
         if tender.category:
-            formatted += f"   📂 類別：{tender.category}\n"
+            fragments.append(f"   📂 類別：{tender.category}\n")
         
         # 日期資訊
         if tender.announcement_date:
-            formatted += f"   📅 公告：{tender.announcement_date}\n"
+            fragments.append(f"   📅 公告：{tender.announcement_date}\n")
         
         if tender.deadline:
-            formatted += f"   ⏰ 截止：{tender.deadline}\n"
+            fragments.append(f"   ⏰ 截止：{tender.deadline}\n")
         
         # 描述資訊
         if tender.description:
-            formatted += f"   📝 描述：{tender.description}\n"
+            fragments.append(f"   📝 描述：{tender.description}\n")
         
-        return formatted
+        return "".join(fragments)
     
     def _truncate_description(self, description: Optional[str]) -> Optional[str]:
         """截斷過長的描述"""
         if not description:
             return None
         
-        if len(description) <= self.max_description_length:
+        max_length = self.max_description_length
+        if len(description) <= max_length:
             return description
         
-        return description[:self.max_description_length] + "..."
+        return description[:max_length] + "..."
     
     def _extract_amount_number(self, amount_str: str) -> Optional[float]:
         """從金額字串中提取數字（萬為單位）"""
         if not amount_str:
             return None
         
-        import re
-        # 尋找數字模式
-        numbers = re.findall(r'[\d,]+\.?\d*', amount_str.replace(',', ''))
+        # 尋找第一個數字
+        match = _AMOUNT_RE.search(amount_str.replace(',', ''))
         
-        if numbers:
+        if match:
             try:
-                # 取第一個數字
-                return float(numbers[0])
+                return float(match.group(0))
             except ValueError:
                 pass
         
@@ -275,27 +287,39 @@ def extract_key_info(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     if not results:
         return {"summary": "無搜尋結果"}
     
-    key_info = {
-        "total_count": len(results),
-        "agencies": list(set(r.get('agency') for r in results if r.get('agency'))),
-        "categories": list(set(r.get('category') for r in results if r.get('category'))),
-        "amount_ranges": [],
-        "recent_tenders": []
-    }
+    # 單次走訪收集機關、類別與金額範圍（以字典鍵去重，保留首次出現的順序）
+    agencies: Dict[str, None] = {}
+    categories: Dict[str, None] = {}
+    amount_ranges = []
+    recent_tenders = []
     
-    # 提取金額範圍
-    for result in results:
+    for i, result in enumerate(results):
+        agency = result.get('agency')
+        if agency:
+            agencies[agency] = None
+        
+        category = result.get('category')
+        if category:
+            categories[category] = None
+        
         amount = result.get('amount')
         if amount:
-            key_info["amount_ranges"].append(amount)
-    
-    # 提取最近的招標案（假設有日期資訊）
-    for result in results[:3]:  # 取前3個作為最近的
-        if result.get('tender_name'):
-            key_info["recent_tenders"].append({
-                "name": result.get('tender_name'),
-                "agency": result.get('agency'),
-                "amount": result.get('amount')
-            })
+            amount_ranges.append(amount)
+        
+        # 提取最近的招標案（假設有日期資訊，取前3個作為最近的）
+        if i < 3:
+            tender_name = result.get('tender_name')
+            if tender_name:
+                recent_tenders.append({
+                    "name": tender_name,
+                    "agency": agency,
+                    "amount": amount
+                })
     
-    return key_info
+    return {
+        "total_count": len(results),
+        "agencies": list(agencies),
+        "categories": list(categories),
+        "amount_ranges": amount_ranges,
+        "recent_tenders": recent_tenders
+    }
@@ -5,14 +5,15 @@ from datetime import datetime, timezone
 from bs4 import BeautifulSoup, Tag
 from graphiti_core import Graphiti
 from graphiti_core.nodes import EpisodeType
-from pydantic import BaseModel
+from dataclasses import dataclass
 from typing import List, Dict, Any
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class Episode(BaseModel):
+@dataclass(slots=True)
+class Episode:
     title: str
     content: str
     
@@ -5,6 +5,7 @@
 """
 
 import asyncio
+import io
 import os
 import logging
 from datetime import datetime, timezone
@@ -98,14 +99,16 @@ class SampleTenderProcessor:
             # 寫入實體摘要
             if entities:
                 try:
-                    entity_summary = f"招標案「{tender_data.get('tender_name', '未知')}」相關實體：\n"
+                    buffer = io.StringIO()
+                    buffer.write(f"招標案「{tender_data.get('tender_name', '未知')}」相關實體：\n")
                     for entity in entities:
-                        entity_summary += f"- {entity.entity_type}: {entity.name}\n"
+                        buffer.write(f"- {entity.entity_type}: {entity.name}\n")
                         # 加入重要屬性
                         if entity.entity_type == "Amount" and entity.properties.get("amount_value"):
-                            entity_summary += f"  金額: {entity.properties['amount_value']}\n"
+                            buffer.write(f"  金額: {entity.properties['amount_value']}\n")
                         elif entity.entity_type == "Date" and entity.properties.get("date_value"):
-                            entity_summary += f"  日期: {entity.properties['date_value']}\n"
+                            buffer.write(f"  日期: {entity.properties['date_value']}\n")
+                    entity_summary = buffer.getvalue()
                     
                     await self.graphiti_client.add_episode(
                         name=f"實體摘要_{tender_data.get('tender_name', '未知')}",
@@ -5,6 +5,7 @@
 """
 
 import asyncio
+import io
 import logging
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
@@ -264,9 +265,11 @@ class TenderProcessor:
             # 12. 記錄實體資訊（目前以 Episode 形式儲存實體關聯）
             if entities:
                 try:
-                    entity_summary = "自定義實體類型：\n"
+                    buffer = io.StringIO()
+                    buffer.write("自定義實體類型：\n")
                     for entity in entities:
-                        entity_summary += f"- {entity.entity_type}: {entity.name}\n"
+                        buffer.write(f"- {entity.entity_type}: {entity.name}\n")
+                    entity_summary = buffer.getvalue()
 
                     # 檢查實體摘要內容安全性
                     is_safe = True  # 預設為安全
@@ -0,0 +1,116 @@
+"""
+ConfigLoader 黑名單比對、允許機關與配置讀寫測試
+"""
+
+import json
+import os
+
+import pytest
+
+from src import config_loader as config_loader_module
+from src.config_loader import ConfigLoader
+
+
+@pytest.fixture(params=["automaton", "fallback"])
+def loader(request, monkeypatch):
+    """分別以 Aho-Corasick 自動機與逐一子字串比對兩種路徑建立載入器"""
+    if request.param == "automaton":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(config_loader_module, "ahocorasick", None)
+    loader = ConfigLoader("config/__missing__.json")
+    loader.update_config("content_filter", "blacklist_keywords", ["ABC", "AI", "密碼"])
+    return loader
+
+
+def test_mixed_case_keywords_match_case_insensitively(loader):
+    assert loader.contains_blacklisted("this abc text")
+    assert sorted(loader.scan_blacklist("ai 與 Abc 以及密碼")) == ["ABC", "AI", "密碼"]
+    assert not loader.contains_blacklisted("nothing here")
+
+
+def test_added_mixed_case_keyword_reports_original_spelling(loader):
+    loader.scan_blacklist("warm up")
+    assert loader.add_blacklist_keyword("OpenAI Key")
+    assert not loader.add_blacklist_keyword("OpenAI Key")
+    assert sorted(loader.scan_blacklist("my openai key")) == ["AI", "OpenAI Key"]
+    assert loader.get_blacklist_keywords()[-1] == "OpenAI Key"
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """寫入暫存配置文件，測試前後清除已解析配置快取"""
+    ConfigLoader.invalidate_cache()
+    path = tmp_path / "content_filter_config.json"
+    write_config(path, allowed_agencies=[])
+    yield path
+    ConfigLoader.invalidate_cache()
+
+
+def write_config(path, allowed_agencies, mtime_ns=None):
+    path.write_text(json.dumps({
+        "content_filter": {"enabled": True, "blacklist_keywords": ["密碼"], "allowed_agencies": allowed_agencies},
+    }, ensure_ascii=False), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_allowed_agencies_updated_in_place(config_file):
+    loader = ConfigLoader(str(config_file))
+    assert loader.is_agency_allowed("任何機關")
+
+    assert loader.add_allowed_agencies(["甲機關", "乙機關", "甲機關"]) == 2
+    assert not loader.add_allowed_agency("乙機關")
+    assert loader.add_allowed_agency("丙機關")
+
+    assert loader.is_agency_allowed("甲機關")
+    assert loader.is_agency_allowed("丙機關")
+    assert not loader.is_agency_allowed("丁機關")
+    assert loader.config["content_filter"]["allowed_agencies"] == ["甲機關", "乙機關", "丙機關"]
+    assert loader.get_allowed_agencies() == ["甲機關", "乙機關", "丙機關"]
+
+
+def test_changed_file_reloaded_and_cache_invalidated(config_file):
+    assert ConfigLoader(str(config_file)).get_allowed_agencies() == []
+
+    # 內容與修改時間不同時，新的載入器會重新解析文件
+    write_config(config_file, ["甲機關"], mtime_ns=config_file.stat().st_mtime_ns + 10**9)
+    assert ConfigLoader(str(config_file)).get_allowed_agencies() == ["甲機關"]
+
+    ConfigLoader.invalidate_cache()
+    assert not config_loader_module._CONFIG_CACHE
+    assert not ConfigLoader._resolved_paths
+    assert ConfigLoader(str(config_file)).get_allowed_agencies() == ["甲機關"]
+
+
+def test_loaded_config_does_not_share_cached_copy(config_file):
+    first = ConfigLoader(str(config_file))
+    first.add_allowed_agency("甲機關")
+
+    assert ConfigLoader(str(config_file)).get_allowed_agencies() == []
+
+
+def test_save_config_writes_atomically(config_file, tmp_path):
+    loader = ConfigLoader(str(config_file))
+    loader.add_allowed_agency("甲機關")
+    save_path = tmp_path / "saved" / "config.json"
+
+    assert loader.save_config(str(save_path))
+
+    assert not (tmp_path / "saved" / "config.json.tmp").exists()
+    assert json.loads(save_path.read_text(encoding="utf-8")) == loader.config
+    assert ConfigLoader(str(save_path)).get_allowed_agencies() == ["甲機關"]
+
+
+def test_save_config_keeps_original_when_replace_fails(config_file, monkeypatch):
+    original = config_file.read_bytes()
+    loader = ConfigLoader(str(config_file))
+    loader.add_allowed_agency("甲機關")
+
+    def failing_replace(src, dst):
+        raise OSError("模擬替換失敗")
+
+    monkeypatch.setattr(config_loader_module.os, "replace", failing_replace)
+
+    assert not loader.save_config()
+    assert config_file.read_bytes() == original
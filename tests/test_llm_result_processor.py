@@ -0,0 +1,142 @@
+"""
+LLMResultProcessor 合併請求測試
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.langgraph_integration.tools import llm_result_processor as processor_module
+from src.langgraph_integration.tools.llm_result_processor import LLMResultProcessor
+
+
+class StubCompletions:
+    """依序回傳預設回覆的 chat.completions 替身，回覆為例外時直接拋出"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
+
+
+def make_processor(monkeypatch, replies):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    processor = LLMResultProcessor()
+    completions = StubCompletions(replies)
+    processor.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return processor, completions
+
+
+def fact_results(text):
+    return [SimpleNamespace(fact=text, name="關係"), SimpleNamespace(fact=text + "（續）", name="關係")]
+
+
+# 第二個工作沒有搜尋結果，不需要 LLM，應直接以基本格式化處理
+JOBS = [
+    (fact_results("甲機關辦理資訊系統案"), "comprehensive", {}),
+    ([], "organization", {"organization": "乙機關"}),
+    (fact_results("丙機關採購伺服器"), "amount", {}),
+    (fact_results("丁機關委託顧問服務"), "category", {}),
+]
+EMPTY_RESULT_TEXT = "未找到相關招標案。"
+
+
+def test_all_sections_answered_in_single_request(monkeypatch):
+    processor, completions = make_processor(
+        monkeypatch, ['```json\n{"S1": "答一", "S2": "答三", "S3": "答四"}\n```']
+    )
+
+    outputs = asyncio.run(processor.process_batched(JOBS))
+
+    assert outputs == ["答一", EMPTY_RESULT_TEXT, "答三", "答四"]
+    assert len(completions.requests) == 1
+    assert completions.requests[0]["max_tokens"] == 800 * 3
+
+
+def test_invalid_section_falls_back_per_job(monkeypatch):
+    processor, completions = make_processor(
+        monkeypatch, ['{"S1": "答一", "S2": 5}', "逐一答三", "逐一答四"]
+    )
+
+    outputs = asyncio.run(processor.process_batched(JOBS))
+
+    # S2 不是字串、S3 缺少，只有這兩個區段改為逐一請求
+    assert outputs == ["答一", EMPTY_RESULT_TEXT, "逐一答三", "逐一答四"]
+    assert len(completions.requests) == 3
+
+
+@pytest.mark.parametrize("failure", ["這不是 JSON", '["S1"]', RuntimeError("連線中斷")])
+def test_unusable_response_falls_back_for_all_jobs(monkeypatch, failure):
+    processor, completions = make_processor(monkeypatch, [failure, "逐一一", "逐一三", "逐一四"])
+
+    outputs = asyncio.run(processor.process_batched(JOBS))
+
+    assert outputs == ["逐一一", EMPTY_RESULT_TEXT, "逐一三", "逐一四"]
+    assert len(completions.requests) == 4
+
+
+async def _capture_single_request(monkeypatch, job):
+    processor, completions = make_processor(monkeypatch, ["略"])
+    await processor.process_search_results(*job)
+    return completions.requests[0]
+
+
+def test_merged_prompt_over_budget_goes_per_job(monkeypatch):
+    processor, completions = make_processor(monkeypatch, ["逐一一", "逐一三", "逐一四"])
+    single_prompt_chars = sum(
+        len(message["content"])
+        for message in asyncio.run(_capture_single_request(monkeypatch, JOBS[0]))["messages"]
+    )
+    # 上限足以容納單一請求，但容納不下合併後的請求
+    monkeypatch.setattr(processor_module, "_MAX_PROMPT_CHARS", single_prompt_chars + 50)
+
+    outputs = asyncio.run(processor.process_batched(JOBS))
+
+    assert outputs == ["逐一一", EMPTY_RESULT_TEXT, "逐一三", "逐一四"]
+    assert all(request["max_tokens"] == 800 for request in completions.requests)
+
+
+def test_jobs_split_into_bounded_batches(monkeypatch):
+    jobs = [(fact_results(f"案件{i}"), "comprehensive", {}) for i in range(6)]
+    processor, completions = make_processor(
+        monkeypatch, ['{"S1": "1", "S2": "2", "S3": "3", "S4": "4"}', '{"S1": "5", "S2": "6"}']
+    )
+
+    outputs = asyncio.run(processor.process_batched(jobs))
+
+    assert outputs == ["1", "2", "3", "4", "5", "6"]
+    assert sorted(request["max_tokens"] for request in completions.requests) == [1600, 3200]
+
+
+def test_close_shared_http_client_resets_processor(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(processor_module, "_llm_processor", None)
+    monkeypatch.setattr(processor_module, "_shared_http_client", None)
+
+    async def scenario():
+        processor = processor_module.get_llm_processor()
+        http_client = processor_module._shared_http_client
+        await processor_module.close_shared_http_client()
+        assert http_client.is_closed
+        # 關閉後重新取得的處理器使用新的連線池
+        assert processor_module.get_llm_processor() is not processor
+        assert processor_module._shared_http_client is not http_client
+        await processor_module.close_shared_http_client()
+
+    asyncio.run(scenario())
+
+
+def test_results_json_identical_with_and_without_orjson(monkeypatch):
+    data = [{"fact": "甲機關辦理「資訊系統」案", "budget": 1500000, "tags": ["A", "B"], "note": None}]
+    with_orjson = processor_module._dump_results_json(data)
+    monkeypatch.setattr(processor_module, "orjson", None)
+
+    assert processor_module._dump_results_json(data) == with_orjson
+    assert with_orjson == '[{"fact":"甲機關辦理「資訊系統」案","budget":1500000,"tags":["A","B"],"note":null}]'
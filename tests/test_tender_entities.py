@@ -0,0 +1,38 @@
+"""
+招標實體批次建立測試
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from src.entities import AmountEntity, build_tender_entities_bulk
+
+
+def test_bulk_build_with_validation_coerces_fields():
+    entities = build_tender_entities_bulk("Amount", [
+        {"amount_value": "1500000", "amount_type": "預算金額"},
+        {"amount_value": 2000, "tax_included": "true"},
+    ])
+
+    assert all(type(entity) is AmountEntity for entity in entities)
+    assert entities[0].amount_value == 1500000.0
+    assert entities[0].currency == "TWD"
+    assert entities[1].tax_included is True
+
+
+def test_bulk_build_with_validation_rejects_invalid_record():
+    with pytest.raises(ValidationError):
+        build_tender_entities_bulk("Amount", [{"amount_value": 100}, {"amount_value": "不是數字"}])
+
+
+def test_bulk_build_without_validation_constructs_as_given():
+    entities = build_tender_entities_bulk("Amount", [{"amount_value": "不是數字"}], validate=False)
+
+    assert type(entities[0]) is AmountEntity
+    assert entities[0].amount_value == "不是數字"
+    assert entities[0].currency == "TWD"
+
+
+def test_unknown_entity_type_raises_key_error():
+    with pytest.raises(KeyError):
+        build_tender_entities_bulk("Unknown", [{}])
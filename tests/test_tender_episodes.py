@@ -0,0 +1,188 @@
+"""
+招標 episodes 建立與批量寫入測試
+"""
+
+import asyncio
+
+import pytest
+
+from src.episodes import tender_episodes
+from src.episodes.tender_episodes import (
+    EpisodeBulkWriteError,
+    add_multiple_tender_episodes,
+    create_tender_entities,
+    create_tender_entities_batch,
+    extract_technology_keywords,
+    extract_technology_keywords_lower,
+)
+
+
+class FakeGraphitiClient:
+    """記錄收到的批次，可指定第 N 次寫入（從 1 起算）失敗"""
+
+    def __init__(self, events, fail_on=None):
+        self.events = events
+        self.fail_on = fail_on
+        self.chunks = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def add_episode_bulk(self, episodes):
+        self.chunks.append([episode['name'] for episode in episodes])
+        number = len(self.chunks)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.events.append(f"send {number} start")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        self.events.append(f"send {number} end")
+        self.in_flight -= 1
+        if number == self.fail_on:
+            raise ConnectionError(f"第 {number} 批寫入失敗")
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """記錄每筆 episode 的建立時機，與寫入事件交錯比對"""
+    events = []
+    create_episode = tender_episodes.create_graphiti_episode
+
+    def recording_create(tender_data, reference_time=None):
+        events.append(f"build {tender_data['tender_name']}")
+        return create_episode(tender_data, reference_time)
+
+    monkeypatch.setattr(tender_episodes, "create_graphiti_episode", recording_create)
+    return events
+
+
+def tenders(count):
+    return [{'tender_name': f"T{i}", 'agency': "測試機關"} for i in range(count)]
+
+
+def test_chunks_sent_in_order_one_at_a_time(events):
+    client = FakeGraphitiClient(events)
+
+    asyncio.run(add_multiple_tender_episodes(client, tenders(5), chunk_size=2))
+
+    assert client.chunks == [["tender_T0", "tender_T1"], ["tender_T2", "tender_T3"], ["tender_T4"]]
+    assert client.max_in_flight == 1
+    # 下一批在前一批寫入期間建立
+    assert events == [
+        "build T0", "build T1",
+        "send 1 start", "build T2", "build T3", "send 1 end",
+        "send 2 start", "build T4", "send 2 end",
+        "send 3 start", "send 3 end",
+    ]
+
+
+def test_send_failure_stops_remaining_chunks(events):
+    client = FakeGraphitiClient(events, fail_on=2)
+
+    with pytest.raises(EpisodeBulkWriteError) as exc_info:
+        asyncio.run(add_multiple_tender_episodes(client, tenders(5), chunk_size=2))
+
+    assert exc_info.value.completed_chunks == 1
+    assert exc_info.value.total_chunks == 3
+    assert isinstance(exc_info.value.__cause__, ConnectionError)
+    assert len(client.chunks) == 2
+
+
+def test_build_failure_on_first_chunk_sends_nothing(events):
+    client = FakeGraphitiClient(events)
+
+    with pytest.raises(EpisodeBulkWriteError) as exc_info:
+        asyncio.run(add_multiple_tender_episodes(client, [None] + tenders(3), chunk_size=2))
+
+    assert exc_info.value.completed_chunks == 0
+    assert client.chunks == []
+
+
+def test_build_failure_on_later_chunk_waits_for_current_send(events):
+    client = FakeGraphitiClient(events)
+
+    with pytest.raises(EpisodeBulkWriteError) as exc_info:
+        asyncio.run(add_multiple_tender_episodes(client, tenders(2) + [None] + tenders(2), chunk_size=2))
+
+    assert exc_info.value.completed_chunks == 1
+    assert isinstance(exc_info.value.__cause__, TypeError)
+    assert len(client.chunks) == 1
+    assert events[-1] == "send 1 end"
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_invalid_chunk_size_rejected(chunk_size):
+    with pytest.raises(ValueError):
+        asyncio.run(add_multiple_tender_episodes(FakeGraphitiClient([]), tenders(1), chunk_size=chunk_size))
+
+
+# 關鍵字在文字中的出現順序與關鍵字表順序相反，用來驗證輸出依關鍵字表排序
+TECHNOLOGY_TEXTS = {
+    "建置 NLP 文字探勘與 Dashboard 儀表板，導入巨量資料平台": ["大數據", "視覺化", "自然語言處理"],
+    "感測器 IoT 串接 ETL 並上雲端": ["雲端運算", "資料倉儲", "物聯網"],
+    "預測模型 MongoDB 區塊鏈": ["區塊鏈", "資料庫", "預測分析"],
+    "一般辦公用品採購": [],
+    "AI": ["人工智慧"],
+    "A": [],
+}
+
+
+def use_technology_path(monkeypatch, path):
+    """切換技術關鍵字比對路徑（Aho-Corasick 自動機或逐一子字串比對）"""
+    if path == "fallback":
+        monkeypatch.setattr(tender_episodes, "ahocorasick", None)
+    tender_episodes._get_technology_automaton.cache_clear()
+
+
+@pytest.fixture(params=["automaton", "fallback"])
+def technology_path(request, monkeypatch):
+    if request.param == "automaton":
+        pytest.importorskip("ahocorasick")
+    use_technology_path(monkeypatch, request.param)
+    yield request.param
+    tender_episodes._get_technology_automaton.cache_clear()
+
+
+@pytest.mark.parametrize("text, expected", TECHNOLOGY_TEXTS.items())
+def test_technology_keywords_in_table_order(technology_path, text, expected):
+    assert extract_technology_keywords(text) == expected
+    assert extract_technology_keywords_lower(text.lower()) == expected
+
+
+def test_technology_paths_produce_identical_output(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    tenders_with_text = [
+        {'tender_name': text, 'agency': "測試機關", 'description': "資料分析與 Cloud 服務"}
+        for text in TECHNOLOGY_TEXTS
+    ]
+
+    use_technology_path(monkeypatch, "automaton")
+    automaton_keywords = [extract_technology_keywords(text) for text in TECHNOLOGY_TEXTS]
+    automaton_entities = create_tender_entities_batch(tenders_with_text)
+    use_technology_path(monkeypatch, "fallback")
+    fallback_keywords = [extract_technology_keywords(text) for text in TECHNOLOGY_TEXTS]
+    fallback_entities = create_tender_entities_batch(tenders_with_text)
+    tender_episodes._get_technology_automaton.cache_clear()
+
+    assert automaton_keywords == fallback_keywords
+    assert automaton_entities == fallback_entities
+
+
+def test_entities_batch_matches_single_build(technology_path):
+    tender_list = [
+        {'tender_name': "巨量資料分析平台建置", 'agency': "甲機關"},
+        {'tender_name': "辦公室清潔", 'agency': "乙機關"},
+        {'tender_name': "雲端服務", 'agency': "丙機關", 'description': "導入 AI 模型"},
+    ]
+
+    batch = create_tender_entities_batch(tender_list)
+
+    assert batch == [create_tender_entities(tender_data) for tender_data in tender_list]
+    technologies = [
+        [(entity.name, entity.properties["domain"]) for entity in entities if entity.entity_type == "Technology"]
+        for entities in batch
+    ]
+    assert technologies == [
+        [("大數據", "大數據與AI"), ("資料科學", "大數據與AI")],
+        [],
+        [("人工智慧", "大數據與AI"), ("雲端運算", "資訊技術")],
+    ]